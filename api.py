@@ -1,15 +1,57 @@
-from flask import Flask, request, jsonify, send_file, abort
+from flask import Flask, Response, request, jsonify, send_file, abort, stream_with_context
 from flask_cors import CORS
 from functools import wraps
 import json
-import csv
 import io
-import pandas as pd
-from app import generate_test_cases
+import os
+from core import (
+    generate_test_cases,
+    stream_test_cases,
+    regenerate_test_cases,
+    generate_test_cases_batch,
+    iter_generate_batch,
+    get_cache_stats,
+    get_scheduler_stats,
+    get_escalation,
+    get_job_queue,
+    get_metrics,
+    submit_job,
+    save_suite,
+    load_suite,
+    search_cases,
+    REPOSITORY_ENABLED,
+    export_seconds,
+    stage_seconds,
+    DEDUPE_THRESHOLD,
+    METRICS_ENABLED,
+)
+from dedupe import dedupe_suite
+from exporter import (
+    EXCEL_MIMETYPE,
+    EXPORT_FORMATS,
+    gzip_chunks,
+    iter_csv,
+    iter_ndjson,
+    iter_rows,
+    render_export,
+    write_excel,
+)
+from metrics import time_iter
+from ratelimit import UpstreamRateLimited
+from suite_store import ArtifactCache
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for external clients
 
+# Maximum number of modules accepted by /api/generate/batch
+MAX_BATCH_SIZE = 100
+
+# Longest long-poll accepted by GET /api/jobs/<id>?wait=
+MAX_JOB_WAIT_SECONDS = 60
+
+# Rendered exports cached per (suite ID, format)
+artifact_cache = ArtifactCache()
+
 # Configure allowed IP addresses
 ALLOWED_IPS = [
     '127.0.0.1',      # localhost
@@ -49,6 +91,15 @@ def require_ip_whitelist(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def rate_limited_response(error):
+    """429 response for when Groq keeps rate limiting after all retries"""
+    response = jsonify({"error": "Upstream rate limit exceeded, please retry later"})
+    response.status_code = 429
+    if error.retry_after:
+        response.headers['Retry-After'] = str(int(error.retry_after + 0.999))
+    return response
+
+
 @app.route('/api/generate', methods=['POST'])
 @require_ip_whitelist
 def generate():
@@ -60,13 +111,163 @@ def generate():
         if not module.strip():
             return jsonify({"error": "Module description is required"}), 400
 
-        result = generate_test_cases(module)
+        previous_suite_id = data.get('previous_suite_id')
+        if previous_suite_id:
+            # Diff-aware mode: only sections changed since that suite are generated
+            previous = load_suite(previous_suite_id)
+            if previous is None:
+                return jsonify({"error": "Previous suite not found"}), 404
+            result = regenerate_test_cases(module, previous, parallel_categories=data.get('parallel_categories'))
+        else:
+            result = generate_test_cases(module, parallel_categories=data.get('parallel_categories'))
 
         if "error" in result:
             return jsonify(result), 500
 
-        return jsonify(result), 200
+        result["suite_id"] = save_suite(result, replaces=previous_suite_id, description=module)
+        with stage_seconds.time(stage="serialize"):
+            response = jsonify(result)
+        return response, 200
 
+    except UpstreamRateLimited as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/escalations/<escalation_id>', methods=['GET'])
+@require_ip_whitelist
+def escalation_status(escalation_id):
+    """State of a fast-first escalation; includes the replacement suite once done"""
+    escalation = get_escalation(escalation_id)
+    if escalation is None:
+        return jsonify({"error": "Escalation not found"}), 404
+    return jsonify(escalation), 200
+
+
+@app.route('/api/jobs', methods=['POST'])
+@require_ip_whitelist
+def create_job():
+    """Queue a background generation and return its job ID immediately"""
+    data = request.get_json(silent=True) or {}
+    module = data.get('module', '')
+    priority = data.get('priority', 0)
+
+    if not isinstance(module, str) or not module.strip():
+        return jsonify({"error": "Module description is required"}), 400
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        return jsonify({"error": "'priority' must be an integer (higher runs first)"}), 400
+
+    job_id = submit_job(module, priority, data.get('parallel_categories'))
+    response = jsonify({"job_id": job_id, "status": "queued"})
+    response.headers['Location'] = f"/api/jobs/{job_id}"
+    return response, 202
+
+
+@app.route('/api/jobs', methods=['GET'])
+@require_ip_whitelist
+def list_jobs():
+    """Most recent jobs (?status=queued|running|done|failed|cancelled, ?limit=)"""
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    queue = get_job_queue()
+    return jsonify({"jobs": queue.list(request.args.get('status'), limit), "counts": queue.stats()}), 200
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+@require_ip_whitelist
+def get_job(job_id):
+    """Job status and result; ?wait=<seconds> long-polls until the job finishes"""
+    wait = request.args.get('wait', 0, type=float)
+    queue = get_job_queue()
+    if wait > 0:
+        job = queue.wait(job_id, min(wait, MAX_JOB_WAIT_SECONDS))
+    else:
+        job = queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+@require_ip_whitelist
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = get_job_queue().cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+
+def sse_event(event, data):
+    """Format a single Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/api/generate/stream', methods=['POST'])
+@require_ip_whitelist
+def generate_stream():
+    """Generate test cases and stream each one as a Server-Sent Event"""
+    data = request.get_json(silent=True) or {}
+    module = data.get('module', '')
+
+    if not module.strip():
+        return jsonify({"error": "Module description is required"}), 400
+
+    def events():
+        try:
+            for event, payload in stream_test_cases(module):
+                if event == "done":
+                    payload["suite_id"] = save_suite(payload, description=module)
+                yield sse_event(event, payload)
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/generate/batch', methods=['POST'])
+@require_ip_whitelist
+def generate_batch():
+    """Generate test cases for several modules concurrently.
+
+    Pass ?stream=true (or Accept: application/x-ndjson) to receive one
+    NDJSON line per module as soon as it finishes.
+    """
+    data = request.get_json(silent=True) or {}
+    modules = data.get('modules')
+    max_workers = data.get('max_workers')
+
+    if not isinstance(modules, list) or not modules:
+        return jsonify({"error": "A non-empty 'modules' list is required"}), 400
+    if len(modules) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} modules per batch"}), 400
+    if not all(isinstance(m, str) for m in modules):
+        return jsonify({"error": "Every module must be a string"}), 400
+    if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+        return jsonify({"error": "'max_workers' must be a positive integer"}), 400
+
+    stream = request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+    if stream or request.accept_mimetypes.best == 'application/x-ndjson':
+        def lines():
+            for item in iter_generate_batch(modules, max_workers):
+                if "result" in item:
+                    item["result"]["suite_id"] = save_suite(item["result"], description=item["module"])
+                yield json.dumps(item) + "\n"
+
+        return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
+    try:
+        batch = generate_test_cases_batch(modules, max_workers)
+        for item in batch["results"]:
+            if "result" in item:
+                item["result"]["suite_id"] = save_suite(item["result"], description=item["module"])
+        return jsonify(batch), 200
+    except UpstreamRateLimited as e:
+        return rate_limited_response(e)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -79,7 +280,8 @@ def export_json():
         data = request.get_json()
         test_cases = data.get('test_cases', {})
 
-        json_str = json.dumps(test_cases, indent=2)
+        with export_seconds.time(format="json"):
+            json_str = json.dumps(test_cases, indent=2)
 
         return jsonify({
             "data": json_str,
@@ -98,25 +300,8 @@ def export_csv():
         data = request.get_json()
         test_cases = data.get('test_cases', {})
 
-        # Create CSV in memory
-        output = io.StringIO()
-        fieldnames = ["ID", "Title", "Scenario", "Type", "Steps", "Expected Result", "Status"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-
-        writer.writeheader()
-
-        for tc in test_cases.get("test_cases", []):
-            writer.writerow({
-                "ID": tc.get("id", ""),
-                "Title": tc.get("title", ""),
-                "Scenario": tc.get("scenario", ""),
-                "Type": tc.get("type", ""),
-                "Steps": "; ".join(tc.get("steps", [])),
-                "Expected Result": tc.get("expected_result", ""),
-                "Status": tc.get("status", "Pending")
-            })
-
-        csv_data = output.getvalue()
+        with export_seconds.time(format="csv"):
+            csv_data = "".join(iter_csv(iter_rows(test_cases)))
 
         return jsonify({
             "data": csv_data,
@@ -127,6 +312,35 @@ def export_csv():
         return jsonify({"error": str(e)}), 500
 
 
+def streaming_export(chunks, mimetype, filename, fmt):
+    """Stream an export body, gzip-compressed when ?gzip=true"""
+    chunks = time_iter(chunks, export_seconds, format=f"{fmt}_stream")
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+
+@app.route('/api/export/csv/stream', methods=['POST'])
+@require_ip_whitelist
+def export_csv_stream():
+    """Stream test cases as a raw text/csv body (add ?gzip=true to compress)"""
+    data = request.get_json(silent=True) or {}
+    test_cases = data.get('test_cases', {})
+    return streaming_export(iter_csv(iter_rows(test_cases)), 'text/csv', 'test_cases.csv', 'csv')
+
+
+@app.route('/api/export/ndjson', methods=['POST'])
+@require_ip_whitelist
+def export_ndjson():
+    """Stream test cases as NDJSON, one case per line (add ?gzip=true to compress)"""
+    data = request.get_json(silent=True) or {}
+    test_cases = data.get('test_cases', {})
+    return streaming_export(iter_ndjson(test_cases), 'application/x-ndjson', 'test_cases.ndjson', 'ndjson')
+
+
 @app.route('/api/export/excel', methods=['POST'])
 @require_ip_whitelist
 def export_excel():
@@ -135,62 +349,14 @@ def export_excel():
         data = request.get_json()
         test_cases = data.get('test_cases', {})
 
-        # Create DataFrame
-        df_data = []
-        for tc in test_cases.get("test_cases", []):
-            df_data.append({
-                "ID": tc.get("id", ""),
-                "Title": tc.get("title", ""),
-                "Scenario": tc.get("scenario", ""),
-                "Type": tc.get("type", ""),
-                "Steps": "; ".join(tc.get("steps", [])),
-                "Expected Result": tc.get("expected_result", ""),
-                "Status": tc.get("status", "Pending")
-            })
-
-        df = pd.DataFrame(df_data)
-
-        # Create Excel file in memory with formatting
         output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Test Cases')
-
-            # Get the worksheet
-            from openpyxl.styles import PatternFill, Font
-            worksheet = writer.sheets['Test Cases']
-
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(cell.value)
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-
-            # Color code status column
-            status_col = 7  # Column G (Status)
-            for row in range(2, len(df_data) + 2):
-                cell = worksheet.cell(row=row, column=status_col)
-                if cell.value == "Passed":
-                    cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                    cell.font = Font(color="006100", bold=True)
-                elif cell.value == "Failed":
-                    cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                    cell.font = Font(color="9C0006", bold=True)
-                elif cell.value == "Pending":
-                    cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                    cell.font = Font(color="9C6500", bold=True)
-
+        with export_seconds.time(format="excel"):
+            write_excel(iter_rows(test_cases), output)
         output.seek(0)
 
         return send_file(
             output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            mimetype=EXCEL_MIMETYPE,
             as_attachment=True,
             download_name='test_cases.xlsx'
         )
@@ -199,6 +365,160 @@ def export_excel():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/suites', methods=['POST'])
+@require_ip_whitelist
+def create_suite():
+    """Store a (possibly edited) suite server-side and return its suite ID.
+
+    An edited copy of a stored suite replaces it in /api/cases: pass the
+    original as "replaces", or post the suite with its "suite_id" still set.
+    """
+    data = request.get_json(silent=True) or {}
+    test_cases = data.get('test_cases')
+
+    if not isinstance(test_cases, dict) or not isinstance(test_cases.get('test_cases'), list):
+        return jsonify({"error": "A 'test_cases' suite object is required"}), 400
+    replaces = data.get('replaces') or test_cases.get('suite_id')
+    if replaces is not None and not isinstance(replaces, str):
+        return jsonify({"error": "'replaces' must be a suite ID"}), 400
+
+    return jsonify({"suite_id": save_suite(test_cases, replaces=replaces)}), 201
+
+
+@app.route('/api/suites/dedupe', methods=['POST'])
+@require_ip_whitelist
+def dedupe_suite_endpoint():
+    """Collapse near-duplicate test cases in a posted or stored suite.
+
+    Body: {"test_cases": {...}} or {"suite_id": "..."}, plus optional
+    "threshold" (0-1, default DEDUPE_THRESHOLD) and "renumber" (default true).
+    """
+    data = request.get_json(silent=True) or {}
+    threshold = data.get('threshold', DEDUPE_THRESHOLD)
+    if not isinstance(threshold, (int, float)) or not 0 < threshold <= 1:
+        return jsonify({"error": "'threshold' must be a number between 0 and 1"}), 400
+
+    if data.get('suite_id'):
+        suite = load_suite(data['suite_id'])
+        if suite is None:
+            return jsonify({"error": "Suite not found"}), 404
+        suite.pop('suite_id', None)
+    else:
+        suite = data.get('test_cases')
+        if not isinstance(suite, dict) or not isinstance(suite.get('test_cases'), list):
+            return jsonify({"error": "A 'test_cases' suite object or a 'suite_id' is required"}), 400
+
+    try:
+        result, duplicates = dedupe_suite(suite, threshold, renumber_ids=data.get('renumber', True))
+        result = dict(result, duplicates=duplicates)
+        result["suite_id"] = save_suite(
+            {k: v for k, v in result.items() if k != "duplicates"}, replaces=data.get('suite_id')
+        )
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/cases', methods=['GET'])
+@require_ip_whitelist
+def list_cases():
+    """Search every stored test case, newest first.
+
+    Query parameters: q (full text over title, scenario, steps and expected
+    result; word* for a prefix), type, status, module, suite_id, limit (max
+    500) and cursor (the next_cursor of the previous page).
+    """
+    if not REPOSITORY_ENABLED:
+        abort(404)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    cursor = request.args.get('cursor', type=int)
+    filters = {name: request.args.get(name) for name in ('type', 'status', 'module', 'suite_id')}
+    page = search_cases(request.args.get('q'), cursor, limit, **filters)
+    with stage_seconds.time(stage="serialize"):
+        response = jsonify(page)
+    return response, 200
+
+
+@app.route('/api/suites/<suite_id>', methods=['GET'])
+@require_ip_whitelist
+def get_suite(suite_id):
+    """Return a stored suite"""
+    suite = load_suite(suite_id)
+    if suite is None:
+        return jsonify({"error": "Suite not found"}), 404
+    return jsonify(suite), 200
+
+
+@app.route('/api/suites/<suite_id>/export', methods=['GET'])
+@require_ip_whitelist
+def export_suite(suite_id):
+    """Export a stored suite (?format=json|csv|ndjson|excel|text, optional ?gzip=true)"""
+    fmt = request.args.get('format', 'json').lower()
+    if fmt == 'xlsx':
+        fmt = 'excel'
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes') and fmt != 'excel'
+    cache_format = fmt + ('+gzip' if compress else '')
+    etag = f"{suite_id}-{cache_format}"
+
+    # Suite IDs are content hashes, so a rendered export never changes
+    if etag in request.if_none_match:
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+
+    try:
+        body = artifact_cache.get(suite_id, cache_format)
+        if body is None:
+            suite = load_suite(suite_id)
+            if suite is None:
+                return jsonify({"error": "Suite not found"}), 404
+            suite.pop('suite_id', None)
+            with export_seconds.time(format=fmt):
+                body = render_export(suite, fmt)
+            if compress:
+                body = b"".join(gzip_chunks([body.decode('utf-8')]))
+            artifact_cache.set(suite_id, cache_format, body)
+
+        mimetype, filename = EXPORT_FORMATS[fmt]
+        headers = {
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'ETag': f'"{etag}"',
+            'Cache-Control': 'private, max-age=86400',
+        }
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+        return Response(body, mimetype=mimetype, headers=headers)
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+@require_ip_whitelist
+def cache_stats():
+    """Response cache hit/miss counters"""
+    stats = get_cache_stats()
+    stats["artifacts"] = artifact_cache.stats()
+    return jsonify(stats), 200
+
+
+@app.route('/api/upstream/stats', methods=['GET'])
+@require_ip_whitelist
+def upstream_stats():
+    """Groq call, retry and rate-limit counters"""
+    return jsonify(get_scheduler_stats()), 200
+
+
+@app.route('/api/metrics', methods=['GET'])
+@require_ip_whitelist
+def prometheus_metrics():
+    """Stage timings, token usage and cache/upstream counters in Prometheus text format"""
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Metrics are disabled (METRICS_ENABLED=false)"}), 404
+    return Response(get_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/api/health', methods=['GET'])
 @require_ip_whitelist
 def health():
@@ -206,5 +526,15 @@ def health():
     return jsonify({"status": "healthy"}), 200
 
 
+@app.before_request
+def start_job_workers():
+    """Start the job workers in the process that serves requests (flask run, WSGI)"""
+    get_job_queue()
+
+
 if __name__ == '__main__':
+    # Resume jobs left queued by an earlier run right away. With the debug
+    # reloader, only the child process (WERKZEUG_RUN_MAIN) serves requests.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_job_queue()
     app.run(debug=True, port=5000)
@@ -0,0 +1,243 @@
+"""Load-test the Flask API and export paths against a local mock Groq server.
+
+Starts benchmarks/mock_groq.py in-process, points the Groq client at it via
+GROQ_BASE_URL, serves api.py on a local port and drives ``/api/generate``
+and every export endpoint at the requested concurrency levels with synthetic
+suites. Caches and the case repository are disabled so every generate call
+reaches the mock, and all databases live in a temporary directory.
+
+The report (JSON) lists, per scenario: p50/p95/p99 latency, throughput,
+error count, response size and the process's peak RSS so far.
+
+Usage:
+    python benchmarks/bench_api.py --concurrency 1 8 32 --sizes 10 1000 50000 \\
+        --output bench.json [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_groq import MockConfig, start_mock_server, synthetic_suite  # noqa: E402
+from suite_store import suite_hash  # noqa: E402
+
+EXPORTS = [
+    ("POST", "/api/export/json"),
+    ("POST", "/api/export/csv"),
+    ("POST", "/api/export/csv/stream"),
+    ("POST", "/api/export/ndjson"),
+    ("POST", "/api/export/excel"),
+]
+SUITE_EXPORT_FORMATS = ["json", "csv", "ndjson", "excel", "text"]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def request(base, method, path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(base + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=600) as response:
+            size = len(response.read())
+            ok = 200 <= response.status < 300
+    except urllib.error.HTTPError as e:
+        size = len(e.read())
+        ok = False
+    except OSError:
+        size = 0
+        ok = False
+    return time.perf_counter() - start, ok, size
+
+
+def run_scenario(name, concurrency, total, make_call):
+    """Run ``total`` calls of ``make_call(i)`` with ``concurrency`` workers."""
+    latencies = []
+    errors = 0
+    sizes = []
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        elapsed, ok, size = make_call(i)
+        with lock:
+            latencies.append(elapsed)
+            sizes.append(size)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "throughput_rps": round(total / wall, 2) if wall else None,
+        "response_bytes": int(statistics.median(sizes)) if sizes else 0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def start_api():
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import api
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, api.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def compare(report, previous):
+    """Print p95/throughput deltas against an earlier report."""
+    old = {(r["scenario"], r["concurrency"]): r for r in previous.get("results", [])}
+    lines = []
+    for r in report["results"]:
+        before = old.get((r["scenario"], r["concurrency"]))
+        if not before:
+            continue
+        p95 = (r["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0
+        rps = (r["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100 \
+            if before["throughput_rps"] else 0
+        lines.append(f"{r['scenario']:<40} c={r['concurrency']:<4} p95 {p95:+7.1f}%  throughput {rps:+7.1f}%")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 50000])
+    parser.add_argument("--requests", type=int, default=32, help="generate calls per concurrency level")
+    parser.add_argument("--export-requests", type=int, default=8, help="calls per export scenario")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--tokens-per-second", type=float, default=800.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--cases", type=int, default=20, help="test cases per mock completion")
+    parser.add_argument("--skip-generate", action="store_true")
+    parser.add_argument("--skip-exports", action="store_true")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    mock = start_mock_server(MockConfig(
+        args.latency, args.tokens_per_second, args.error_rate, args.malformed_rate, args.cases
+    ))
+    # Keep the run's databases out of the working tree and off the real data
+    db_dir = tempfile.TemporaryDirectory(prefix="bench_api_")
+    os.environ.update({
+        "GROQ_BASE_URL": f"http://127.0.0.1:{mock.server_port}",
+        "GROQ_API_KEY": "mock-key",
+        "CACHE_ENABLED": "false",
+        "SEMANTIC_CACHE_MODE": "off",
+        "GROQ_RPM": "0",
+        "GROQ_TPM": "0",
+        "GROQ_MAX_CONCURRENCY": str(max(args.concurrency)),
+        "SUITE_DB_PATH": os.path.join(db_dir.name, "suites.db"),
+        "CACHE_DB_PATH": os.path.join(db_dir.name, "response_cache.db"),
+        "JOB_DB_PATH": os.path.join(db_dir.name, "jobs.db"),
+        "REPOSITORY_DB_PATH": os.path.join(db_dir.name, "repository.db"),
+        "REPOSITORY_ENABLED": "false",
+    })
+
+    # api.py logs every request to stdout; keep the report readable
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        server, base = start_api()
+        results = []
+
+        if not args.skip_generate:
+            run_id = int(time.time())
+            for c in args.concurrency:
+                results.append(run_scenario(
+                    "generate", c, args.requests,
+                    lambda i, c=c: request(base, "POST", "/api/generate",
+                                           {"module": f"Benchmark module {run_id}-{c}-{i}"}),
+                ))
+
+        if not args.skip_exports:
+            for size in args.sizes:
+                suite = synthetic_suite(size)
+                body = {"test_cases": suite}
+                request(base, "POST", "/api/suites", body)
+                suite_id = suite_hash(suite)
+                for c in args.concurrency:
+                    for method, path in EXPORTS:
+                        results.append(run_scenario(
+                            f"{path} n={size}", c, args.export_requests,
+                            lambda i, path=path: request(base, "POST", path, body),
+                        ))
+                    for fmt in SUITE_EXPORT_FORMATS:
+                        results.append(run_scenario(
+                            f"/api/suites/<id>/export?format={fmt} n={size}", c, args.export_requests,
+                            lambda i, fmt=fmt: request(base, "GET", f"/api/suites/{suite_id}/export?format={fmt}"),
+                        ))
+        server.shutdown()
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        mock.shutdown()
+        db_dir.cleanup()
+
+    report = {
+        "python": sys.version.split()[0],
+        "mock": {
+            "latency": args.latency,
+            "tokens_per_second": args.tokens_per_second,
+            "error_rate": args.error_rate,
+            "malformed_rate": args.malformed_rate,
+            "cases": args.cases,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(report, json.load(f)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Compare output tokens and latency of the compact and full JSON formats.
+
+Offline (default): renders synthetic suites in both formats and reports
+output tokens, the estimated generation time at a given token rate and local
+decode time. With ``--mock`` or ``--live`` the same modules are generated
+with both prompt templates (against benchmarks/mock_groq.py or the real Groq
+API) and the report uses the upstream's ``usage`` and measured latency.
+
+Usage:
+    python benchmarks/bench_compact.py [--sizes 10 20 40] [--tokens-per-second 800]
+    python benchmarks/bench_compact.py --mock --runs 5
+    python benchmarks/bench_compact.py --live --runs 3    # uses GROQ_API_KEY
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compact import encode_compact  # noqa: E402
+from mock_groq import MockConfig, start_mock_server, synthetic_suite  # noqa: E402
+
+MODULES = [
+    "Login page with email and password, remember me checkbox and forgot password link",
+    "Checkout form with shipping address, card payment, coupon codes and order summary",
+    "User profile settings: change display name, avatar upload (max 2 MB), email and password",
+    "Search results page with filters for price range, category and rating, sorting and pagination",
+]
+
+
+def count_tokens(text: str):
+    """Token count with tiktoken when installed, otherwise ~4 characters per token."""
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("cl100k_base").encode(text)), "cl100k_base"
+    except ImportError:
+        return max(1, len(text) // 4), "chars/4"
+
+
+def time_decode(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def offline(args, core):
+    results = []
+    for size in args.sizes:
+        suite = synthetic_suite(size)
+        full = json.dumps(suite, indent=2)
+        compact = encode_compact(suite)
+        full_tokens, tokenizer = count_tokens(full)
+        compact_tokens, _ = count_tokens(compact)
+        results.append({
+            "cases": size,
+            "tokenizer": tokenizer,
+            "full_tokens": full_tokens,
+            "compact_tokens": compact_tokens,
+            "token_savings_pct": round((1 - compact_tokens / full_tokens) * 100, 1),
+            "est_full_generation_s": round(full_tokens / args.tokens_per_second, 2),
+            "est_compact_generation_s": round(compact_tokens / args.tokens_per_second, 2),
+            "full_decode_ms": round(time_decode(lambda: core.parse_model_output(full, "m")) * 1000, 3),
+            "compact_decode_ms": round(
+                time_decode(lambda: core.parse_model_output(compact, "m", compact=True)) * 1000, 3
+            ),
+        })
+    return results
+
+
+def generate(core, module, fmt):
+    core.OUTPUT_FORMAT = fmt
+    prompt = core.prompt_template().format(module=module)
+    start = time.perf_counter()
+    response = core.create_completion(
+        model=core.MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=core.TEMPERATURE,
+    )
+    elapsed = time.perf_counter() - start
+    text = response.choices[0].message.content.strip()
+    suite = core.parse_model_output(text, module, compact=fmt == "compact")
+    usage = getattr(response, "usage", None)
+    return {
+        "latency_s": elapsed,
+        "completion_tokens": getattr(usage, "completion_tokens", None) or count_tokens(text)[0],
+        "prompt_tokens": getattr(usage, "prompt_tokens", None) or count_tokens(prompt)[0],
+        "cases": len(suite.get("test_cases", [])),
+        "fallback": any("not in the compact format" in r for r in suite.get("repairs", [])),
+        "error": suite.get("error"),
+    }
+
+
+def online(args, core):
+    runs = {"json": [], "compact": []}
+    for _ in range(args.runs):
+        for module in MODULES:
+            # Alternate formats so upstream load drift affects both equally
+            for fmt in ("json", "compact"):
+                runs[fmt].append(generate(core, module, fmt))
+
+    summary = {}
+    for fmt, items in runs.items():
+        ok = [r for r in items if not r["error"]]
+        cases = sum(r["cases"] for r in ok) or 1
+        summary[fmt] = {
+            "calls": len(items),
+            "errors": len(items) - len(ok),
+            "compact_fallbacks": sum(1 for r in items if r["fallback"]),
+            "p50_latency_s": round(statistics.median(r["latency_s"] for r in ok), 3) if ok else None,
+            "mean_completion_tokens": round(statistics.mean(r["completion_tokens"] for r in ok), 1) if ok else None,
+            "mean_prompt_tokens": round(statistics.mean(r["prompt_tokens"] for r in ok), 1) if ok else None,
+            "completion_tokens_per_case": round(sum(r["completion_tokens"] for r in ok) / cases, 1),
+            "seconds_per_case": round(sum(r["latency_s"] for r in ok) / cases, 3),
+        }
+    full, compact = summary["json"], summary["compact"]
+    if full["seconds_per_case"] and compact["seconds_per_case"]:
+        summary["savings_pct"] = {
+            "tokens_per_case": round(
+                (1 - compact["completion_tokens_per_case"] / full["completion_tokens_per_case"]) * 100, 1
+            ),
+            "seconds_per_case": round((1 - compact["seconds_per_case"] / full["seconds_per_case"]) * 100, 1),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--tokens-per-second", type=float, default=800.0)
+    parser.add_argument("--mock", action="store_true", help="generate against a local mock server")
+    parser.add_argument("--live", action="store_true", help="generate against the Groq API")
+    parser.add_argument("--runs", type=int, default=3, help="rounds over the sample modules (--mock/--live)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CACHE_ENABLED", "false")
+    mock = None
+    if args.mock:
+        mock = start_mock_server(MockConfig(latency=0.05, tokens_per_second=args.tokens_per_second))
+        os.environ.update({
+            "GROQ_BASE_URL": f"http://127.0.0.1:{mock.server_port}",
+            "GROQ_API_KEY": "mock-key",
+            "GROQ_RPM": "0",
+            "GROQ_TPM": "0",
+        })
+    import core
+
+    report = {"offline": offline(args, core)}
+    try:
+        if args.mock or args.live:
+            report["mock" if args.mock else "live"] = online(args, core)
+    finally:
+        if mock:
+            mock.shutdown()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Fill the test case repository with synthetic suites and time /api/cases queries.
+
+Builds (or reuses) a repository database of ``--cases`` synthetic cases,
+inserted in bulk transactions, then times representative searches: the
+newest page, type/status filters, full-text queries with common and rare
+words, combined text and filters, and a deep page reached by keyset cursor.
+
+Usage:
+    python benchmarks/bench_repository.py --cases 1000000 --db /tmp/repository.db [--runs 50]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from repository import CaseRepository  # noqa: E402
+
+TYPES = ["Functional", "Negative", "Boundary", "Security"]
+STATUSES = ["Pending"] * 6 + ["Passed"] * 3 + ["Failed"]
+FEATURES = ["login", "checkout", "profile", "search", "cart", "payment", "upload", "settings", "report", "invite"]
+FIELDS = ["email", "password", "coupon", "avatar", "quantity", "address", "token", "filter", "date", "role"]
+ACTIONS = ["submit", "validate", "reject", "accept", "display", "save", "retry", "lock", "expire", "sort"]
+
+
+def synthetic_suite(n: int, cases: int, rng):
+    feature = FEATURES[n % len(FEATURES)]
+    test_cases = []
+    for i in range(cases):
+        field, action = rng.choice(FIELDS), rng.choice(ACTIONS)
+        test_cases.append({
+            "id": f"TC-{i + 1:03d}",
+            "title": f"{action.title()} {field} on {feature} (variant {n}-{i})",
+            "scenario": f"Verify the {feature} page can {action} the {field} value",
+            "type": TYPES[i % len(TYPES)],
+            "steps": [f"Open the {feature} page", f"Enter a {field}", f"Click {action}"],
+            "expected_result": f"The {field} is handled and the user sees a confirmation ({rng.randint(0, 10 ** 6)})",
+            "status": rng.choice(STATUSES),
+        })
+    return {"module": f"{feature.title()} module {n}", "total_test_cases": len(test_cases), "test_cases": test_cases}
+
+
+def fill(repository, total: int, per_suite: int, batch_suites: int):
+    rng = random.Random(1)
+    start = time.perf_counter()
+    added = repository.stats()["cases"]
+    n = added // per_suite
+    while added < total:
+        batch = []
+        for _ in range(batch_suites):
+            batch.append((f"bench-{n:08d}", synthetic_suite(n, per_suite, rng)))
+            n += 1
+        added += repository.add_suites(batch)
+    return time.perf_counter() - start
+
+
+def time_query(repository, runs: int, **kwargs):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = repository.search(**kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "rows": len(result["cases"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=1_000_000)
+    parser.add_argument("--db", default="bench_repository.db")
+    parser.add_argument("--per-suite", type=int, default=25)
+    parser.add_argument("--batch-suites", type=int, default=400, help="suites per insert transaction")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    repository = CaseRepository(args.db)
+    fill_seconds = fill(repository, args.cases, args.per_suite, args.batch_suites)
+    stats = repository.stats()
+
+    deep = repository.search(limit=1, cursor=stats["cases"] // 2 + 1)["cases"]
+    deep_cursor = stats["cases"] // 2
+    scenarios = {
+        "newest_page": {},
+        "type": {"type": "Security"},
+        "status": {"status": "Failed"},
+        "type_and_status": {"type": "Security", "status": "Failed"},
+        "text_common": {"q": "password"},
+        "text_rare": {"q": "variant 4242"},
+        "text_prefix": {"q": "check*"},
+        "text_and_filters": {"q": "coupon reject", "type": "Negative", "status": "Failed"},
+        "deep_page_cursor": {"cursor": deep_cursor},
+        "deep_page_filtered": {"cursor": deep_cursor, "type": "Boundary", "status": "Passed"},
+    }
+    report = {
+        "cases": stats["cases"],
+        "suites": stats["suites"],
+        "fill_seconds": round(fill_seconds, 1),
+        "db_mb": round(os.path.getsize(args.db) / 1e6, 1),
+        "deep_page_sample": bool(deep),
+        "queries": {name: time_query(repository, args.runs, **kwargs) for name, kwargs in scenarios.items()},
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
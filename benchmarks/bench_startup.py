@@ -0,0 +1,96 @@
+"""Measure cold-import cost of the API and UI entry points.
+
+Each target is imported in a fresh interpreter several times; the report
+lists wall-clock import time (min/median/max), the slowest modules according
+to ``python -X importtime`` and which heavy optional dependencies were pulled
+in at import time.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be imported on first use by the API process
+HEAVY_MODULES = ["streamlit", "pandas", "numpy", "openpyxl", "groq", "httpx"]
+
+TARGETS = {
+    "core": "import core",
+    "api": "import api",
+    # The UI entry point: app.py pulls in Streamlit and resolves the API key
+    "app": "import app",
+}
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.*)")
+
+
+def run_probe(statement):
+    env = dict(os.environ, GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "benchmark-placeholder"))
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(statement, limit=10):
+    env = dict(os.environ, GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "benchmark-placeholder"))
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT, env=env,
+        capture_output=True, text=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((int(match.group(2)), match.group(3).strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000.0, 2)} for us, name in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--targets", nargs="*", default=list(TARGETS))
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "runs": args.runs, "targets": {}}
+    for name in args.targets:
+        statement = TARGETS[name]
+        samples = [run_probe(statement) for _ in range(args.runs)]
+        seconds = [s["seconds"] for s in samples]
+        report["targets"][name] = {
+            "min_ms": round(min(seconds) * 1000, 2),
+            "median_ms": round(statistics.median(seconds) * 1000, 2),
+            "max_ms": round(max(seconds) * 1000, 2),
+            "heavy_modules": samples[-1]["heavy_modules"],
+            "slowest_imports": slowest_imports(statement),
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Local stand-in for the Groq (OpenAI-compatible) chat completions API.
+
+Serves ``POST /openai/v1/chat/completions`` with synthetic test suites so the
+API and export paths can be load-tested without spending real tokens. Point
+the app at it with ``GROQ_BASE_URL=http://127.0.0.1:<port>``.
+
+Usage:
+    python benchmarks/mock_groq.py --port 8099 --latency 0.3 --tokens-per-second 800 \\
+        --error-rate 0.02 --malformed-rate 0.05 --cases 20
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact import encode_compact  # noqa: E402
+
+TYPES = ["Functional", "Negative", "Boundary", "Security"]
+WORDS = (
+    "user login password email field button page submit error message valid invalid "
+    "session token account profile form input limit length empty special character "
+    "redirect dashboard request response timeout retry access denied role admin"
+).split()
+
+
+def synthetic_suite(n: int, module: str = "Synthetic module", seed: int = 0):
+    """Build a deterministic suite of ``n`` plausible-looking test cases."""
+    rng = random.Random(seed)
+
+    def phrase(k):
+        return " ".join(rng.choice(WORDS) for _ in range(k))
+
+    return {
+        "module": module,
+        "total_test_cases": n,
+        "test_cases": [
+            {
+                "id": f"TC-{i:03d}",
+                "title": phrase(4).capitalize(),
+                "scenario": phrase(14).capitalize() + ".",
+                "type": TYPES[i % len(TYPES)],
+                "steps": [phrase(6).capitalize() for _ in range(rng.randint(2, 5))],
+                "expected_result": phrase(10).capitalize() + ".",
+                "status": "Pending",
+            }
+            for i in range(1, n + 1)
+        ],
+    }
+
+
+def malform(text: str, rng: random.Random) -> str:
+    """Damage JSON the way LLMs tend to (fences, trailing commas, truncation)."""
+    kind = rng.choice(["fence", "trailing_comma", "truncate"])
+    if kind == "fence":
+        return f"Here are the test cases:\n```json\n{text}\n```"
+    if kind == "trailing_comma":
+        return re.sub(r'("status": "Pending")', r"\1,", text)
+    return text[: int(len(text) * rng.uniform(0.5, 0.95))]
+
+
+class MockConfig:
+    def __init__(self, latency=0.3, tokens_per_second=800.0, error_rate=0.0,
+                 malformed_rate=0.0, cases=20, seed=0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.cases = cases
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def roll(self):
+        with self.lock:
+            self.requests += 1
+            return self.rng.random(), self.rng.random(), self.rng.randint(0, 1 << 30)
+
+
+def make_handler(config: MockConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._json(404, {"error": {"message": "not found"}})
+                return
+
+            error_roll, malformed_roll, seed = config.roll()
+            time.sleep(config.latency)
+            if error_roll < config.error_rate:
+                with config.lock:
+                    config.errors += 1
+                if error_roll < config.error_rate / 2:
+                    self._json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                               {"retry-after": "1"})
+                else:
+                    self._json(503, {"error": {"message": "Service unavailable"}})
+                return
+
+            prompt = " ".join(m.get("content", "") for m in request.get("messages", []))
+            match = re.search(r"MODULE:\s*\n(.*?)\n", prompt)
+            module = match.group(1).strip() if match else "Synthetic module"
+            suite = synthetic_suite(config.cases, module, seed)
+            # Answer compact prompts (OUTPUT_FORMAT=compact) in the compact row format
+            if "one JSON array per line" in prompt:
+                text = encode_compact(suite)
+            else:
+                text = json.dumps(suite, indent=2)
+            if malformed_roll < config.malformed_rate:
+                text = malform(text, random.Random(seed))
+
+            prompt_tokens = len(prompt) // 4
+            completion_tokens = len(text) // 4
+            model = request.get("model", "mock")
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+            if request.get("stream"):
+                self._stream(text, model, completion_id)
+                return
+
+            if config.tokens_per_second:
+                time.sleep(completion_tokens / config.tokens_per_second)
+            self._json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+        def _stream(self, text, model, completion_id):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def send(data):
+                payload = f"data: {data}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+                self.wfile.flush()
+
+            chunk_chars = 64
+            delay = (chunk_chars / 4) / config.tokens_per_second if config.tokens_per_second else 0
+            for i in range(0, len(text), chunk_chars):
+                send(json.dumps({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": text[i:i + chunk_chars]}, "finish_reason": None}],
+                }))
+                if delay:
+                    time.sleep(delay)
+            send("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_mock_server(config: MockConfig, host="127.0.0.1", port=0):
+    """Start the mock server on a background thread and return it."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=800.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 429/503 responses")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of damaged JSON answers")
+    parser.add_argument("--cases", type=int, default=20, help="test cases per completion")
+    args = parser.parse_args()
+
+    config = MockConfig(args.latency, args.tokens_per_second, args.error_rate, args.malformed_rate, args.cases)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    print(f"Mock Groq server on http://{args.host}:{args.port} (set GROQ_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
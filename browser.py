@@ -0,0 +1,104 @@
+import bisect
+import math
+import re
+from collections import defaultdict
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def searchable_text(tc: dict) -> str:
+    """The text a suite search matches against: title, scenario and steps."""
+    steps = tc.get("steps") or []
+    if not isinstance(steps, list):
+        steps = [str(steps)]
+    return " ".join([str(tc.get("title", "")), str(tc.get("scenario", ""))] + [str(s) for s in steps]).lower()
+
+
+class SuiteBrowser:
+    """Search, filter and page through a suite of any size.
+
+    Built once per suite. Type and status are kept as integer-coded NumPy
+    columns, so filters are vectorized masks; an inverted index maps every
+    word of the title, scenario and steps to the rows containing it, so a
+    search only touches the posting lists of its words (the last word also
+    matches as a prefix, for search-as-you-type). Only the rows of the
+    requested page are ever turned back into dicts.
+    """
+
+    def __init__(self, test_cases):
+        import numpy as np
+
+        self.np = np
+        self.cases = test_cases
+        self.types = sorted({str(tc.get("type", "Unknown")) for tc in test_cases})
+        self.statuses = sorted({str(tc.get("status", "Pending")) for tc in test_cases})
+        type_codes = {t: i for i, t in enumerate(self.types)}
+        status_codes = {s: i for i, s in enumerate(self.statuses)}
+        self._type_col = np.fromiter(
+            (type_codes[str(tc.get("type", "Unknown"))] for tc in test_cases), dtype=np.int16, count=len(test_cases)
+        )
+        self._status_col = np.fromiter(
+            (status_codes[str(tc.get("status", "Pending"))] for tc in test_cases), dtype=np.int16,
+            count=len(test_cases),
+        )
+
+        postings = defaultdict(list)
+        for row, tc in enumerate(test_cases):
+            for word in set(WORD.findall(searchable_text(tc))):
+                postings[word].append(row)
+        self._postings = {word: np.asarray(rows, dtype=np.int32) for word, rows in postings.items()}
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self):
+        return len(self.cases)
+
+    def _word_rows(self, word: str, prefix: bool):
+        if not prefix:
+            return self._postings.get(word)
+        start = bisect.bisect_left(self._vocabulary, word)
+        end = bisect.bisect_left(self._vocabulary, word + "￿")
+        if start == end:
+            return None
+        return self.np.concatenate([self._postings[w] for w in self._vocabulary[start:end]])
+
+    def mask(self, search: str = "", types=None, statuses=None):
+        """Boolean array of the rows matching every search word and the filters."""
+        np = self.np
+        mask = np.ones(len(self.cases), dtype=bool)
+        if types:
+            codes = [i for i, t in enumerate(self.types) if t in types]
+            mask &= np.isin(self._type_col, codes)
+        if statuses:
+            codes = [i for i, s in enumerate(self.statuses) if s in statuses]
+            mask &= np.isin(self._status_col, codes)
+
+        words = WORD.findall(search.lower())
+        for i, word in enumerate(words):
+            rows = self._word_rows(word, prefix=i == len(words) - 1)
+            if rows is None:
+                return np.zeros(len(self.cases), dtype=bool)
+            word_mask = np.zeros(len(self.cases), dtype=bool)
+            word_mask[rows] = True
+            mask &= word_mask
+        return mask
+
+    def query(self, search: str = "", types=None, statuses=None, page: int = 1, page_size: int = 50):
+        """Return one page of matching row numbers with the match count.
+
+        ``page`` is clamped to the available pages, so a page number that
+        became too large after narrowing a filter shows the last page.
+        """
+        matches = self.np.flatnonzero(self.mask(search, types, statuses))
+        pages = max(1, math.ceil(len(matches) / page_size))
+        page = min(max(1, int(page)), pages)
+        start = (page - 1) * page_size
+        return {
+            "rows": [int(row) for row in matches[start:start + page_size]],
+            "total": int(len(matches)),
+            "page": page,
+            "pages": pages,
+        }
+
+    def page_cases(self, rows):
+        """The test cases at the given row numbers."""
+        return [self.cases[row] for row in rows]
@@ -0,0 +1,164 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_module_text(module: str) -> str:
+    """Collapse whitespace so trivially different submissions share a cache entry."""
+    return " ".join(module.split())
+
+
+def make_cache_key(module: str, model: str, temperature: float, template: str) -> str:
+    """Build a content-addressed key for a generation request."""
+    template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    payload = json.dumps({
+        "module": normalize_module_text(module),
+        "model": model,
+        "temperature": temperature,
+        "template": template_hash,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache: a bounded in-memory LRU in front of a SQLite store.
+
+    Entries older than ``ttl`` seconds are treated as missing. When the disk
+    store grows past ``max_entries`` the least recently used rows are evicted.
+    """
+
+    def __init__(self, path="response_cache.db", memory_items=256, max_entries=5000, ttl=7 * 24 * 3600):
+        self.path = path
+        self.memory_items = memory_items
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _db(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, created_at, value):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return a copy of the cached value for ``key`` or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return copy.deepcopy(value)
+                del self._memory[key]
+
+            try:
+                db = self._db()
+                row = db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    db.commit()
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                db.commit()
+            except sqlite3.Error:
+                self.misses += 1
+                return None
+
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self.hits += 1
+            self.disk_hits += 1
+            return copy.deepcopy(value)
+
+    def set(self, key, value):
+        """Store ``value`` under ``key`` in both tiers."""
+        now = time.time()
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, now, value)
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now),
+                )
+                self._evict(db, now)
+                db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self, db, now):
+        db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        count = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            try:
+                db = self._db()
+                db.execute("DELETE FROM responses")
+                db.commit()
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        """Return hit/miss counters and current tier sizes."""
+        with self._lock:
+            try:
+                disk_entries = self._db().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            except sqlite3.Error:
+                disk_entries = None
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
@@ -0,0 +1,76 @@
+import json
+
+from repair import FENCE
+
+# One-letter type codes used by the compact output format
+TYPE_CODES = {"F": "Functional", "N": "Negative", "B": "Boundary", "S": "Security"}
+CODES_BY_TYPE = {v: k for k, v in TYPE_CODES.items()}
+
+
+def encode_compact(suite: dict) -> str:
+    """Render a suite in the compact row format (one JSON array per line)."""
+    lines = []
+    for tc in suite.get("test_cases", []):
+        row = [
+            CODES_BY_TYPE.get(tc.get("type"), "F"),
+            tc.get("title", ""),
+            tc.get("scenario", ""),
+            list(tc.get("steps") or []),
+            tc.get("expected_result", ""),
+        ]
+        lines.append(json.dumps(row, ensure_ascii=False))
+    return "\n".join(lines)
+
+
+def _decode_row(line: str):
+    row = json.loads(line)
+    if not isinstance(row, list) or len(row) != 5:
+        raise ValueError("row must be a 5-element array")
+    code, title, scenario, steps, expected = row
+    if code not in TYPE_CODES:
+        raise ValueError(f"unknown type code {code!r}")
+    if not all(isinstance(v, str) for v in (title, scenario, expected)):
+        raise ValueError("title, scenario and expected result must be strings")
+    if not isinstance(steps, list) or not all(isinstance(s, str) for s in steps):
+        raise ValueError("steps must be an array of strings")
+    return {
+        "title": title.strip(),
+        "scenario": scenario.strip(),
+        "type": TYPE_CODES[code],
+        "steps": [s.strip() for s in steps if s.strip()],
+        "expected_result": expected.strip(),
+    }
+
+
+def decode_compact(text: str, module: str):
+    """Expand compact rows into a suite dict with local IDs and statuses.
+
+    Every line must be a valid row; only the last line may be cut off (a
+    truncated completion), in which case it is dropped and noted. Returns
+    ``(suite, repairs)``, or ``(None, [reason])`` when the text is not in the
+    compact format.
+    """
+    match = FENCE.search(text)
+    if match:
+        text = match.group(1)
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    # Tolerate the rows being wrapped in a single outer array
+    if lines and lines[0] == "[" and lines[-1] == "]":
+        lines = [line.rstrip(",") for line in lines[1:-1]]
+
+    cases = []
+    repairs = []
+    for i, line in enumerate(lines):
+        try:
+            cases.append(_decode_row(line.rstrip(",")))
+        except (ValueError, TypeError) as e:
+            if i == len(lines) - 1 and cases and not line.endswith("]"):
+                repairs.append("dropped truncated last row")
+                break
+            return None, [f"line {i + 1} is not a compact row: {e}"]
+
+    if not cases:
+        return None, ["no compact rows found"]
+    cases = [{"id": f"TC-{n:03d}", **tc, "status": "Pending"} for n, tc in enumerate(cases, 1)]
+    suite = {"module": module, "total_test_cases": len(cases), "test_cases": cases}
+    return suite, repairs
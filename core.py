@@ -0,0 +1,1151 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+from dotenv import load_dotenv
+from cache import ResponseCache, make_cache_key
+from compact import CODES_BY_TYPE, decode_compact
+from decompose import estimate_tokens, module_title, segment_module, with_context
+from hedge import Cancelled, Hedger
+from incremental import next_case_number, plan_regeneration
+from merge import _dedupe_key, merge_suites
+from metrics import Registry
+from ratelimit import AdaptiveScheduler, UpstreamRateLimited
+from repair import repair_model_output
+from routing import EscalationTracker, choose_tier, minimum_cases, module_complexity, parse_tiers, quality_issues
+from singleflight import SingleFlight
+from stream_parser import TestCaseStreamParser
+from suite_store import SuiteStore
+
+# Framework-free generation core shared by the Streamlit UI (via app.py) and
+# the Flask API. Nothing here imports Streamlit, and the Groq SDK is only
+# imported when the first completion is requested.
+
+# Load environment variables
+load_dotenv()
+
+
+class MissingAPIKeyError(RuntimeError):
+    """Raised when no Groq API key has been configured."""
+
+
+_api_key = None
+_client_lock = threading.Lock()
+client = None
+
+
+def configure(api_key: str = None):
+    """Set the Groq API key explicitly (otherwise GROQ_API_KEY is used)."""
+    global _api_key, client
+    with _client_lock:
+        if api_key != _api_key:
+            _api_key = api_key
+            client = None
+
+
+def get_client():
+    """Return the shared Groq client, creating it on first use."""
+    global client
+    if client is None:
+        with _client_lock:
+            if client is None:
+                api_key = _api_key or os.getenv("GROQ_API_KEY")
+                if not api_key:
+                    raise MissingAPIKeyError("GROQ_API_KEY not found. Please set it in your environment or .env file.")
+                from groq import Groq, APIConnectionError
+
+                scheduler.transient_errors = (APIConnectionError,)
+                # Retries are handled by the scheduler below, not by the SDK.
+                # GROQ_BASE_URL points the client at a compatible server (e.g. the benchmark mock)
+                client = Groq(api_key=api_key, base_url=os.getenv("GROQ_BASE_URL") or None, max_retries=0)
+    return client
+
+
+MODEL = "llama-3.1-8b-instant"
+# MODEL = "llama3-70b-8192"
+# MODEL = "llama-3.1-70b-versatile"
+TEMPERATURE = 0.2
+
+# Model routing: "off" always uses MODEL, "complexity" picks a tier from
+# MODEL_TIERS by module complexity, and "fast_first" answers with the first
+# tier and re-generates with the last one in the background when the suite
+# fails local quality checks
+ROUTING_MODE = os.getenv("ROUTING_MODE", "off").lower()
+MODEL_TIERS = parse_tiers(os.getenv("MODEL_TIERS", f"{MODEL}:0,llama-3.3-70b-versatile:40"))
+ROUTING_MIN_CASES = int(os.getenv("ROUTING_MIN_CASES", "8"))
+escalations = EscalationTracker(max_workers=int(os.getenv("ESCALATION_MAX_WORKERS", "2")))
+
+# Response cache (set CACHE_ENABLED=false to always call Groq)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+response_cache = ResponseCache(
+    path=os.getenv("CACHE_DB_PATH", "response_cache.db"),
+    memory_items=int(os.getenv("CACHE_MEMORY_ITEMS", "256")),
+    max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "5000")),
+    ttl=int(os.getenv("CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+)
+
+# Generated suites, addressed by content hash (used for exports by suite ID)
+suite_store = SuiteStore(
+    path=os.getenv("SUITE_DB_PATH", "suites.db"),
+    max_entries=int(os.getenv("SUITE_MAX_ENTRIES", "10000")),
+)
+
+# Client-side rate limiting for Groq calls (0 disables a limit)
+scheduler = AdaptiveScheduler(
+    rpm=int(os.getenv("GROQ_RPM", "30")),
+    tpm=int(os.getenv("GROQ_TPM", "20000")),
+    max_concurrency=int(os.getenv("GROQ_MAX_CONCURRENCY", "8")),
+    max_retries=int(os.getenv("GROQ_MAX_RETRIES", "5")),
+    cancelled_errors=(Cancelled,),
+)
+# Rough completion size used to reserve tokens before a call
+COMPLETION_TOKEN_ESTIMATE = 2048
+
+# Hedged requests: re-send a completion that is slower than the recent
+# HEDGE_PERCENTILE latency, spending at most HEDGE_MAX_RATE extra calls
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+hedger = Hedger(
+    percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+    max_rate=float(os.getenv("HEDGE_MAX_RATE", "0.1")),
+    min_delay=float(os.getenv("HEDGE_MIN_DELAY", "0.5")),
+    min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20")),
+)
+
+# Identical concurrent generations share a single upstream call
+inflight = SingleFlight()
+
+# Generate the four test categories as concurrent completions by default
+PARALLEL_CATEGORIES = os.getenv("PARALLEL_CATEGORIES", "false").lower() in ("1", "true", "yes")
+
+# Long descriptions are split into sub-feature segments generated concurrently
+DECOMPOSE_THRESHOLD_TOKENS = int(os.getenv("DECOMPOSE_THRESHOLD_TOKENS", "1200"))
+SEGMENT_TOKEN_BUDGET = int(os.getenv("SEGMENT_TOKEN_BUDGET", "600"))
+DECOMPOSE_MAX_WORKERS = int(os.getenv("DECOMPOSE_MAX_WORKERS", "4"))
+
+# Collapse near-duplicate test cases (MinHash/LSH) in generated suites
+DEDUPE_ENABLED = os.getenv("DEDUPE_ENABLED", "true").lower() in ("1", "true", "yes")
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.8"))
+
+# Similarity lookup for near-identical module descriptions:
+#   "seed" passes a similar earlier suite's titles to the model as a starting point,
+#   "result" returns a close enough earlier suite instantly (opt-in: character
+#   n-grams cannot tell a one-keyword change from a typo), "off" disables it
+SEMANTIC_CACHE_MODE = os.getenv("SEMANTIC_CACHE_MODE", "seed").lower()
+SEMANTIC_CACHE_THRESHOLD = float(
+    os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95" if SEMANTIC_CACHE_MODE == "result" else "0.85")
+)
+SEMANTIC_CACHE_MAX_ITEMS = int(os.getenv("SEMANTIC_CACHE_MAX_ITEMS", "500"))
+_semantic_index = None
+_semantic_lock = threading.Lock()
+
+# Batch generation worker pool size (all workers share one Groq client)
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+# Background generation jobs (/api/jobs), persisted in SQLite
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+_job_queue = None
+_job_lock = threading.Lock()
+
+# Searchable history of every stored suite and test case (/api/cases)
+REPOSITORY_ENABLED = os.getenv("REPOSITORY_ENABLED", "true").lower() in ("1", "true", "yes")
+REPOSITORY_DB_PATH = os.getenv("REPOSITORY_DB_PATH", "repository.db")
+_repository = None
+_repository_lock = threading.Lock()
+
+# Per-stage timings and token usage, exposed in Prometheus format (/api/metrics)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+metrics = Registry(enabled=METRICS_ENABLED)
+stage_seconds = metrics.histogram(
+    "testgen_stage_seconds", "Time spent in each stage of test case generation", ("stage",)
+)
+generate_seconds = metrics.histogram(
+    "testgen_generate_seconds", "End-to-end generate_test_cases latency", ("outcome",)
+)
+export_seconds = metrics.histogram("testgen_export_seconds", "Time spent rendering an export", ("format",))
+generations_total = metrics.counter("testgen_generations_total", "Generation requests by outcome", ("outcome",))
+errors_total = metrics.counter("testgen_errors_total", "Generation errors by kind", ("kind",))
+tokens_total = metrics.counter("testgen_tokens_total", "Tokens reported by the upstream", ("kind",))
+tokens_per_second = metrics.histogram(
+    "testgen_completion_tokens_per_second", "Completion tokens per second of upstream calls",
+    buckets=(25, 50, 100, 200, 400, 800, 1600, 3200),
+)
+in_flight = metrics.gauge("testgen_in_flight", "Operations currently in progress", ("operation",))
+
+# Model output format: "json" (full schema) or "compact" (one short array per
+# test case, expanded locally; fewer output tokens per case)
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "json").lower()
+
+PROMPT_TEMPLATE = """
+You are a senior QA engineer.
+
+Generate COMPLETE test cases for the following module/page:
+
+MODULE:
+{module}
+
+Cover:
+- Functional test cases
+- Negative test cases
+- Boundary cases
+- Validation checks
+- Basic security cases
+
+Return STRICT JSON only in this format:
+
+{{
+  "module": "{module}",
+  "total_test_cases": number,
+  "test_cases": [
+    {{
+      "id": "TC-001",
+      "title": "Brief descriptive title",
+      "scenario": "Detailed scenario description",
+      "type": "Functional | Negative | Boundary | Security",
+      "steps": ["step1", "step2"],
+      "expected_result": "Expected outcome",
+      "status": "Pending"
+    }}
+  ]
+}}
+
+Rules:
+- ONLY JSON
+- No explanation text
+- Must be valid JSON
+- title should be short (3-8 words)
+- status should always be "Pending" initially
+"""
+
+CATEGORY_PROMPT_TEMPLATE = """
+You are a senior QA engineer.
+
+Generate COMPLETE {category} test cases for the following module/page:
+
+MODULE:
+{module}
+
+Cover ONLY:
+- {focus}
+
+Return STRICT JSON only in this format:
+
+{{
+  "module": "{module}",
+  "total_test_cases": number,
+  "test_cases": [
+    {{
+      "id": "TC-001",
+      "title": "Brief descriptive title",
+      "scenario": "Detailed scenario description",
+      "type": "{category}",
+      "steps": ["step1", "step2"],
+      "expected_result": "Expected outcome",
+      "status": "Pending"
+    }}
+  ]
+}}
+
+Rules:
+- ONLY JSON
+- No explanation text
+- Must be valid JSON
+- title should be short (3-8 words)
+- type must always be "{category}"
+- status should always be "Pending" initially
+"""
+
+# category -> what the category prompt asks for
+TEST_CATEGORIES = {
+    "Functional": "Functional test cases for the main user flows and features",
+    "Negative": "Negative test cases and validation checks for invalid input and error handling",
+    "Boundary": "Boundary cases for limits, lengths, ranges and empty values",
+    "Security": "Basic security cases (authentication, authorization, injection, data exposure)",
+}
+
+
+COMPACT_PROMPT_TEMPLATE = """
+You are a senior QA engineer.
+
+Generate COMPLETE test cases for the following module/page:
+
+MODULE:
+{module}
+
+Cover:
+- Functional test cases
+- Negative test cases
+- Boundary cases
+- Validation checks
+- Basic security cases
+
+Output one JSON array per line per test case and nothing else:
+["<type>","<title>","<scenario>",["<step>","<step>"],"<expected result>"]
+
+<type> is one letter: F = Functional, N = Negative, B = Boundary, S = Security
+
+Rules:
+- ONLY the array lines, no keys, no surrounding list, no numbering
+- No explanation text
+- title should be short (3-8 words)
+"""
+
+COMPACT_CATEGORY_PROMPT_TEMPLATE = """
+You are a senior QA engineer.
+
+Generate COMPLETE {category} test cases for the following module/page:
+
+MODULE:
+{module}
+
+Cover ONLY:
+- {focus}
+
+Output one JSON array per line per test case and nothing else:
+["{code}","<title>","<scenario>",["<step>","<step>"],"<expected result>"]
+
+Rules:
+- ONLY the array lines, no keys, no surrounding list, no numbering
+- No explanation text
+- title should be short (3-8 words)
+- the first element must always be "{code}"
+"""
+
+
+def prompt_template(parallel_categories: bool = False) -> str:
+    """Return the generation prompt template for the configured OUTPUT_FORMAT."""
+    if OUTPUT_FORMAT == "compact":
+        return COMPACT_CATEGORY_PROMPT_TEMPLATE if parallel_categories else COMPACT_PROMPT_TEMPLATE
+    return CATEGORY_PROMPT_TEMPLATE if parallel_categories else PROMPT_TEMPLATE
+
+
+SEED_PROMPT_SECTION = """
+A similar module was tested before with these test case titles. Reuse the
+ones that still apply, adapt them to the module above and add what is missing:
+{titles}
+"""
+
+
+def _usage_tokens(response):
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def _record_usage(response, elapsed: float):
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if prompt_tokens:
+        tokens_total.inc(prompt_tokens, kind="prompt")
+    if completion_tokens:
+        tokens_total.inc(completion_tokens, kind="completion")
+        # Groq reports the generation time itself; fall back to wall time
+        seconds = getattr(usage, "completion_time", None) or elapsed
+        if seconds:
+            tokens_per_second.observe(completion_tokens / seconds)
+
+
+class CompletionStream:
+    """A streamed completion that keeps its scheduler slot until it is closed.
+
+    Iterating yields the chunks and keeps the usage Groq reports on the final
+    chunk (under ``x_groq``) in ``usage``. Closing it, or reading it to the
+    end, closes the HTTP stream (aborting the upstream call if it is still
+    generating), then releases the slot with the actual token count.
+    """
+
+    def __init__(self, stream, release=None):
+        self._stream = stream
+        self._release = release
+        self._closed = False
+        self.usage = None
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                x_groq = getattr(chunk, "x_groq", None)
+                if getattr(x_groq, "usage", None) is not None:
+                    self.usage = x_groq.usage
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self._stream, "close", None)
+            if close:
+                close()
+        finally:
+            if self._release:
+                self._release(_usage_tokens(self))
+
+
+def _read_stream(stream: CompletionStream, settled):
+    """Collect a hedged attempt's stream into a response shaped like a plain one.
+
+    Once the other attempt has ``settled`` the call, the stream is closed
+    instead of being read to the end.
+    """
+    parts = []
+    try:
+        for chunk in stream:
+            if settled.is_set():
+                raise Cancelled()
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+    finally:
+        stream.close()
+    message = SimpleNamespace(content="".join(parts))
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=stream.usage)
+
+
+def create_completion(**kwargs):
+    """Call the Groq chat completion API through the rate-limit scheduler."""
+    prompt_chars = sum(len(m.get("content", "")) for m in kwargs.get("messages", []))
+    completions = get_client().chat.completions
+    start = time.perf_counter()
+
+    estimated_tokens = prompt_chars // 4 + COMPLETION_TOKEN_ESTIMATE
+
+    def send(settled=None):
+        if settled is None:
+            return completions.create(**kwargs)
+        # The other hedge attempt may have won while this one waited for a slot
+        if settled.is_set():
+            raise Cancelled()
+        response = _read_stream(CompletionStream(completions.create(**kwargs, stream=True)), settled)
+        # Settle before the scheduler hands this slot to the other attempt
+        settled.set()
+        return response
+
+    def call(settled=None):
+        return scheduler.call(lambda: send(settled), estimated_tokens=estimated_tokens, usage_tokens=_usage_tokens)
+
+    try:
+        with in_flight.track(operation="upstream"):
+            if kwargs.get("stream"):
+                # The caller reads the stream, so its slot is released when the stream is closed
+                stream, release = scheduler.call(
+                    lambda: completions.create(**kwargs), estimated_tokens=estimated_tokens, hold_slot=True
+                )
+                return CompletionStream(stream, release)
+            # Hedged calls are read as streams so the losing attempt can be aborted
+            response = hedger.call(call) if HEDGE_ENABLED else call()
+    except UpstreamRateLimited:
+        errors_total.inc(kind="rate_limited")
+        raise
+    except Exception:
+        errors_total.inc(kind="upstream")
+        raise
+    elapsed = time.perf_counter() - start
+    stage_seconds.observe(elapsed, stage="upstream")
+    _record_usage(response, elapsed)
+    return response
+
+
+def parse_model_output(text: str, module: str, compact: bool = False):
+    """Parse (and if needed repair) a model completion into a normalized suite.
+
+    With ``compact`` the text is decoded as compact rows first and parsed as
+    the full JSON schema only if that fails. Fixes applied to the output are
+    listed under the suite's ``repairs`` key.
+    """
+    with stage_seconds.time(stage="parse"):
+        result = None
+        if compact:
+            result, repairs = decode_compact(text, module)
+        if result is None:
+            result, repairs = repair_model_output(text, module)
+            if compact and result is not None:
+                repairs.insert(0, "output was not in the compact format, parsed as JSON")
+    if result is None:
+        errors_total.inc(kind="invalid_json")
+        return {"error": "Invalid JSON from model", "raw": text}
+    if repairs:
+        result["repairs"] = repairs
+    return result
+
+
+def remove_near_duplicates(suite: dict, threshold: float = None):
+    """Collapse near-duplicate test cases and note it under ``repairs``."""
+    from dedupe import dedupe_suite
+
+    with stage_seconds.time(stage="dedupe"):
+        result, duplicates = dedupe_suite(suite, DEDUPE_THRESHOLD if threshold is None else threshold)
+    if duplicates:
+        removed = sum(len(ids) for ids in duplicates.values())
+        result["repairs"] = result.get("repairs", []) + [f"collapsed {removed} near-duplicate test cases"]
+    return result
+
+
+def get_semantic_index():
+    """Return the similarity index of past module descriptions, building it on first use."""
+    global _semantic_index
+    if _semantic_index is None:
+        with _semantic_lock:
+            if _semantic_index is None:
+                from semantic_cache import SemanticIndex
+
+                _semantic_index = SemanticIndex(
+                    max_items=SEMANTIC_CACHE_MAX_ITEMS, threshold=SEMANTIC_CACHE_THRESHOLD
+                )
+    return _semantic_index
+
+
+def find_similar_suite(module: str):
+    """Return ``(suite, similarity)`` for the closest earlier module above the threshold."""
+    with stage_seconds.time(stage="semantic_lookup"):
+        match = get_semantic_index().search(module)
+    if match is None:
+        return None
+    suite = suite_store.get(match[0])
+    if suite is None:
+        return None
+    return suite, match[1]
+
+
+def _semantic_result(module: str, suite: dict, similarity: float):
+    """An earlier suite returned for a similar module, marked with ``semantic_match``."""
+    suite_id = suite.pop("suite_id")
+    suite["module"] = module
+    suite["semantic_match"] = {"suite_id": suite_id, "similarity": round(similarity, 4)}
+    return suite
+
+
+def _with_seed(prompt: str, seed: dict = None) -> str:
+    """Append a similar suite's titles to ``prompt`` as a starting point."""
+    if not seed:
+        return prompt
+    titles = "\n".join(f"- {tc.get('title', '')}" for tc in seed.get("test_cases", []))
+    return prompt + SEED_PROMPT_SECTION.format(titles=titles)
+
+
+def route_model(module: str) -> str:
+    """Pick the model for a module according to ROUTING_MODE."""
+    if ROUTING_MODE == "complexity":
+        return choose_tier(MODEL_TIERS, module_complexity(module)["score"])
+    if ROUTING_MODE == "fast_first":
+        return MODEL_TIERS[0][0]
+    return MODEL
+
+
+def generate_test_cases(module: str, use_cache: bool = True, parallel_categories: bool = None,
+                        decompose: bool = None):
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with in_flight.track(operation="generate"):
+            if ROUTING_MODE == "fast_first":
+                outcome, result = _generate_fast_first(module, use_cache, parallel_categories, decompose)
+            else:
+                outcome, result = _generate_test_cases(module, use_cache, parallel_categories, decompose)
+        if "error" in result:
+            outcome = "error"
+        return result
+    finally:
+        generations_total.inc(outcome=outcome)
+        generate_seconds.observe(time.perf_counter() - start, outcome=outcome)
+
+
+def _generate_fast_first(module: str, use_cache: bool, parallel_categories: bool, decompose: bool):
+    """Answer with the fast tier and escalate weak suites to the largest tier in the background."""
+    if parallel_categories is None:
+        parallel_categories = PARALLEL_CATEGORIES
+    fast, large = MODEL_TIERS[0][0], MODEL_TIERS[-1][0]
+    template = prompt_template(parallel_categories)
+    escalation_id = make_cache_key(module, large, TEMPERATURE, template)
+
+    previous = escalations.get(escalation_id)
+    if use_cache and previous and previous["status"] == "done":
+        return "escalated", previous["result"]
+
+    outcome, result = _generate_test_cases(module, use_cache, parallel_categories, decompose, model=fast)
+    if outcome != "generated" or "error" in result or fast == large:
+        return outcome, result
+    issues = quality_issues(result, minimum_cases(module_complexity(module), ROUTING_MIN_CASES))
+    if not issues:
+        return outcome, result
+
+    fast_key = make_cache_key(module, fast, TEMPERATURE, template)
+    fast_saved = threading.Event()
+
+    def replace(better):
+        # Stored once, as the next version of the fast suite
+        fast_saved.wait()
+        better["suite_id"] = save_suite(better, replaces=result["suite_id"], description=module)
+        # Later requests for this module get the larger model's suite
+        if CACHE_ENABLED:
+            response_cache.set(fast_key, better)
+            if SEMANTIC_CACHE_MODE in ("result", "seed") and "category_errors" not in better:
+                get_semantic_index().add(module, suite_store.put(better))
+
+    # The caches would only hand back the fast suite, so the escalation bypasses them
+    result["escalation"] = escalations.start(
+        escalation_id,
+        lambda: _generate_test_cases(module, False, parallel_categories, decompose, model=large)[1],
+        issues,
+        large,
+        on_done=replace,
+    )
+    # Callers save the suite they are handed under the same (content) ID
+    result["suite_id"] = save_suite(result, description=module)
+    fast_saved.set()
+    return outcome, result
+
+
+def _generate_test_cases(module: str, use_cache: bool, parallel_categories: bool, decompose: bool,
+                         model: str = None):
+    """Return ``(outcome, suite)``; outcome is "cache_hit", "semantic_hit" or "generated".
+
+    ``model`` overrides the routing decision (segments are routed one by one).
+    """
+    if parallel_categories is None:
+        parallel_categories = PARALLEL_CATEGORIES
+    if decompose is None:
+        decompose = estimate_tokens(module) > DECOMPOSE_THRESHOLD_TOKENS
+    if decompose:
+        segments = segment_module(module, SEGMENT_TOKEN_BUDGET)
+        if len(segments) > 1:
+            return "generated", _generate_segments(module, segments, use_cache, parallel_categories, model)
+    template = prompt_template(parallel_categories)
+    model = model or route_model(module)
+
+    cache_key = make_cache_key(module, model, TEMPERATURE, template)
+    if use_cache and CACHE_ENABLED:
+        with stage_seconds.time(stage="cache_lookup"):
+            cached = response_cache.get(cache_key)
+        if cached is not None:
+            if ROUTING_MODE != "off":
+                cached.setdefault("model", model)
+            return "cache_hit", cached
+
+    semantic = use_cache and CACHE_ENABLED and SEMANTIC_CACHE_MODE in ("result", "seed")
+    similar = find_similar_suite(module) if semantic else None
+    if similar and SEMANTIC_CACHE_MODE == "result":
+        return "semantic_hit", _semantic_result(module, *similar)
+    seed = similar[0] if similar else None
+
+    if parallel_categories:
+        result = inflight.do(cache_key, lambda: _generate_by_category(module, cache_key, model))
+    else:
+        result = inflight.do(cache_key, lambda: _generate_uncached(module, cache_key, seed, model))
+
+    if ROUTING_MODE != "off" and "error" not in result:
+        result["model"] = model
+    if semantic and "error" not in result and "category_errors" not in result:
+        get_semantic_index().add(module, suite_store.put(result))
+    return "generated", result
+
+
+def _generate_segments(module: str, segments, use_cache: bool, parallel_categories: bool, model: str = None):
+    """Generate each segment of a long description concurrently and stitch the suites."""
+    title = module_title(module)
+
+    def run(segment):
+        try:
+            return _generate_test_cases(
+                with_context(title, segment),
+                use_cache=use_cache,
+                parallel_categories=parallel_categories,
+                decompose=False,
+                model=model,
+            )[1]
+        except Exception as e:
+            return {"error": str(e)}
+
+    workers = max(1, min(DECOMPOSE_MAX_WORKERS, len(segments)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment") as pool:
+        parts = list(pool.map(run, segments))
+
+    labels = [f"segment {i}" for i in range(1, len(parts) + 1)]
+    succeeded = [(label, p) for label, p in zip(labels, parts) if "error" not in p]
+    if not succeeded:
+        return parts[0]
+
+    with stage_seconds.time(stage="merge"):
+        result = merge_suites(module, [p for _, p in succeeded], labels=[label for label, _ in succeeded])
+    if DEDUPE_ENABLED:
+        result = remove_near_duplicates(result)
+    result["segments"] = len(segments)
+    failed = {label: p["error"] for label, p in zip(labels, parts) if "error" in p}
+    if failed:
+        result["segment_errors"] = failed
+    return result
+
+
+def regenerate_test_cases(module: str, previous: dict, previous_description: str = None, use_cache: bool = True,
+                          parallel_categories: bool = None):
+    """Update ``previous`` for an edited description, generating only what changed.
+
+    Cases of unchanged sections are kept as they are; changed and added
+    sections get new IDs after the highest existing one. With no unchanged
+    section this is a plain ``generate_test_cases`` call.
+    """
+    with stage_seconds.time(stage="diff"):
+        plan = plan_regeneration(previous, module, SEGMENT_TOKEN_BUDGET, previous_description)
+    if not plan["kept"]:
+        # Nothing to keep: a full generation, numbered from TC-001
+        result = generate_test_cases(module, use_cache=use_cache, parallel_categories=parallel_categories)
+        if "error" not in result:
+            result["description"] = module
+        return result
+
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with in_flight.track(operation="generate"):
+            texts = dict(plan["sections"])
+            title = module_title(module)
+
+            def run(key):
+                try:
+                    return _generate_test_cases(
+                        with_context(title, texts[key]),
+                        use_cache=use_cache,
+                        parallel_categories=parallel_categories,
+                        decompose=False,
+                    )[1]
+                except Exception as e:
+                    return {"error": str(e)}
+
+            generated = {}
+            if plan["changed"]:
+                workers = max(1, min(DECOMPOSE_MAX_WORKERS, len(plan["changed"])))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="section") as pool:
+                    generated = dict(zip(plan["changed"], pool.map(run, plan["changed"])))
+            failed = {key: part["error"] for key, part in generated.items() if "error" in part}
+            if failed and len(failed) == len(generated):
+                return next(iter(generated.values()))
+
+            cases = []
+            sections = {}
+            seen = set()
+            number = next_case_number(previous)
+            for key, _ in plan["sections"]:
+                if key in plan["kept"]:
+                    section_cases = [dict(tc) for tc in plan["kept"][key]]
+                else:
+                    section_cases = []
+                    for tc in [] if key in failed else generated[key].get("test_cases", []):
+                        section_cases.append(dict(tc, id=f"TC-{number:03d}"))
+                        number += 1
+                # New cases that repeat a kept (or earlier) case are dropped
+                section_cases = [tc for tc in section_cases if _dedupe_key(tc) not in seen]
+                seen.update(_dedupe_key(tc) for tc in section_cases)
+                sections[key] = [tc["id"] for tc in section_cases]
+                cases.extend(section_cases)
+
+            result = {
+                "module": title or module,
+                "description": module,
+                "total_test_cases": len(cases),
+                "test_cases": cases,
+                "sections": sections,
+            }
+            result["incremental"] = {
+                "sections": len(plan["sections"]),
+                "kept_sections": len(plan["kept"]),
+                "regenerated_sections": len(plan["changed"]) - len(failed),
+                "removed_sections": len(plan["removed"]),
+                "kept_cases": sum(len(v) for v in plan["kept"].values()),
+                "new_cases": sum(
+                    len(sections[key]) for key in plan["changed"] if key not in failed
+                ),
+            }
+            if failed:
+                result["section_errors"] = {
+                    texts[key].splitlines()[0][:80]: error for key, error in failed.items()
+                }
+            outcome = "incremental"
+            return result
+    finally:
+        generations_total.inc(outcome=outcome)
+        generate_seconds.observe(time.perf_counter() - start, outcome=outcome)
+
+
+def _complete(prompt: str, module: str, model: str = None):
+    response = create_completion(
+        model=model or MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=TEMPERATURE
+    )
+
+    text = response.choices[0].message.content.strip()
+
+    result = parse_model_output(text, module, compact=OUTPUT_FORMAT == "compact")
+    if DEDUPE_ENABLED and "error" not in result:
+        result = remove_near_duplicates(result)
+    return result
+
+
+def _generate_uncached(module: str, cache_key: str, seed: dict = None, model: str = None):
+    with stage_seconds.time(stage="prompt"):
+        prompt = _with_seed(prompt_template().format(module=module), seed)
+    result = _complete(prompt, module, model)
+    if "error" in result:
+        return result
+
+    if CACHE_ENABLED:
+        response_cache.set(cache_key, result)
+    return result
+
+
+def _generate_category(module: str, category: str, model: str = None):
+    with stage_seconds.time(stage="prompt"):
+        prompt = prompt_template(parallel_categories=True).format(
+            module=module, category=category, focus=TEST_CATEGORIES[category], code=CODES_BY_TYPE[category]
+        )
+    try:
+        return _complete(prompt, module, model)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _generate_by_category(module: str, cache_key: str, model: str = None):
+    """Generate each test category as its own completion and merge the results."""
+    categories = list(TEST_CATEGORIES)
+    with ThreadPoolExecutor(max_workers=len(categories), thread_name_prefix="category") as pool:
+        parts = list(pool.map(lambda category: _generate_category(module, category, model), categories))
+
+    succeeded = [(c, p) for c, p in zip(categories, parts) if "error" not in p]
+    failed = {c: p["error"] for c, p in zip(categories, parts) if "error" in p}
+    if not succeeded:
+        return parts[0]
+
+    with stage_seconds.time(stage="merge"):
+        result = merge_suites(module, [p for _, p in succeeded], labels=[c for c, _ in succeeded])
+    if DEDUPE_ENABLED:
+        result = remove_near_duplicates(result)
+    if failed:
+        # Partial suites are returned but never cached
+        result["category_errors"] = failed
+        return result
+
+    if CACHE_ENABLED:
+        response_cache.set(cache_key, result)
+    return result
+
+
+def can_stream(module: str) -> bool:
+    """Whether ``stream_test_cases`` produces the suite ``generate_test_cases`` would.
+
+    A streamed generation is a single JSON-format completion with MODEL, so
+    it is not used for descriptions long enough to be decomposed, with model
+    routing or parallel categories enabled, or with the compact output format.
+    """
+    return (
+        OUTPUT_FORMAT == "json"
+        and ROUTING_MODE == "off"
+        and not PARALLEL_CATEGORIES
+        and estimate_tokens(module) <= DECOMPOSE_THRESHOLD_TOKENS
+    )
+
+
+def stream_test_cases(module: str, use_cache: bool = True):
+    """Generate test cases with a streamed completion.
+
+    Yields ``("test_case", tc)`` for every test case as soon as it is parsed,
+    followed by a single ``("done", suite)`` or ``("error", details)`` event.
+    The final suite has near-duplicates collapsed (like ``generate_test_cases``),
+    so it can hold fewer cases than were streamed. The semantic lookup
+    applies as in ``generate_test_cases``; see ``can_stream`` for the
+    features that streaming skips.
+    """
+    cache_key = make_cache_key(module, MODEL, TEMPERATURE, PROMPT_TEMPLATE)
+    if use_cache and CACHE_ENABLED:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            generations_total.inc(outcome="cache_hit")
+            for tc in cached.get("test_cases", []):
+                yield "test_case", tc
+            yield "done", cached
+            return
+
+    semantic = use_cache and CACHE_ENABLED and SEMANTIC_CACHE_MODE in ("result", "seed")
+    similar = find_similar_suite(module) if semantic else None
+    if similar and SEMANTIC_CACHE_MODE == "result":
+        generations_total.inc(outcome="semantic_hit")
+        suite = _semantic_result(module, *similar)
+        for tc in suite.get("test_cases", []):
+            yield "test_case", tc
+        yield "done", suite
+        return
+
+    prompt = _with_seed(PROMPT_TEMPLATE.format(module=module), similar[0] if similar else None)
+
+    start = time.perf_counter()
+    stream = create_completion(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=TEMPERATURE,
+        stream=True
+    )
+
+    parser = TestCaseStreamParser()
+    in_flight.inc(operation="stream")
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for tc in parser.feed(delta):
+                yield "test_case", tc
+    finally:
+        in_flight.dec(operation="stream")
+        stage_seconds.observe(time.perf_counter() - start, stage="stream")
+        stream.close()
+    if stream.usage is not None:
+        _record_usage(stream, time.perf_counter() - start)
+
+    result = parse_model_output(parser.text.strip(), module)
+    if "error" in result:
+        generations_total.inc(outcome="error")
+        yield "error", result
+        return
+    generations_total.inc(outcome="generated")
+    if DEDUPE_ENABLED:
+        result = remove_near_duplicates(result)
+
+    if CACHE_ENABLED:
+        response_cache.set(cache_key, result)
+    if semantic:
+        get_semantic_index().add(module, suite_store.put(result))
+    yield "done", result
+
+
+def _batch_item(index: int, module: str):
+    if not module or not module.strip():
+        return {"index": index, "module": module, "error": "Module description is required"}
+    try:
+        result = generate_test_cases(module)
+    except Exception as e:
+        return {"index": index, "module": module, "error": str(e)}
+    if "error" in result:
+        return {"index": index, "module": module, "error": result["error"], "raw": result.get("raw")}
+    return {"index": index, "module": module, "result": result}
+
+
+def iter_generate_batch(modules, max_workers: int = None):
+    """Generate test cases for several modules concurrently.
+
+    Yields one item per module in completion order. Each item carries the
+    module's position in ``modules`` and either a ``result`` or an ``error``.
+    """
+    workers = max(1, min(max_workers or BATCH_MAX_WORKERS, len(modules) or 1))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+    try:
+        futures = [pool.submit(_batch_item, i, m) for i, m in enumerate(modules)]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_test_cases_batch(modules, max_workers: int = None):
+    """Generate test cases for several modules and return results in input order."""
+    results = sorted(iter_generate_batch(modules, max_workers), key=lambda item: item["index"])
+    failed = sum(1 for item in results if "error" in item)
+    return {
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
+def _run_job(payload: dict):
+    result = generate_test_cases(payload["module"], parallel_categories=payload.get("parallel_categories"))
+    if "error" not in result:
+        result["suite_id"] = save_suite(result, description=payload["module"])
+    return result
+
+
+def get_job_queue():
+    """Return the background job queue, starting its workers on first use.
+
+    Jobs left queued or running by an earlier process are resumed.
+    """
+    global _job_queue
+    if _job_queue is None:
+        with _job_lock:
+            if _job_queue is None:
+                from jobs import JobQueue
+
+                queue = JobQueue(path=JOB_DB_PATH, handler=_run_job, workers=JOB_WORKERS, lease=JOB_LEASE_SECONDS)
+                queue.start()
+                _job_queue = queue
+    return _job_queue
+
+
+def submit_job(module: str, priority: int = 0, parallel_categories: bool = None) -> str:
+    """Queue a background generation and return its job ID."""
+    return get_job_queue().submit({"module": module, "parallel_categories": parallel_categories}, priority)
+
+
+def get_repository():
+    """Return the test case repository, opening it on first use."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                from repository import CaseRepository
+
+                _repository = CaseRepository(path=REPOSITORY_DB_PATH)
+    return _repository
+
+
+def save_suite(suite: dict, replaces: str = None, description: str = None) -> str:
+    """Store a suite server-side (and in the repository) and return its suite ID.
+
+    ``replaces`` is the ID of the earlier version this suite supersedes;
+    ``description`` is recorded so a later edit can be diffed against it.
+    """
+    if description is not None:
+        suite["description"] = description
+    with stage_seconds.time(stage="store"):
+        suite_id = suite_store.put(suite)
+    if REPOSITORY_ENABLED:
+        with stage_seconds.time(stage="repository"):
+            get_repository().add_suite(suite_id, suite, replaces)
+    return suite_id
+
+
+def search_cases(q: str = None, cursor: int = None, limit: int = 50, **filters):
+    """Search stored test cases, newest first (see CaseRepository.search)."""
+    with stage_seconds.time(stage="search"):
+        return get_repository().search(q, cursor, limit, **filters)
+
+
+def load_suite(suite_id: str):
+    """Return a stored suite by ID, or None if it is unknown."""
+    return suite_store.get(suite_id)
+
+
+def get_cache_stats():
+    """Return hit/miss counters for the response, semantic and coalescing caches."""
+    stats = response_cache.stats()
+    stats["coalescing"] = inflight.stats()
+    if _semantic_index is not None:
+        stats["semantic"] = _semantic_index.stats()
+    return stats
+
+
+def get_scheduler_stats():
+    """Return retry/rate-limit and hedging counters for upstream Groq calls."""
+    stats = scheduler.stats()
+    if HEDGE_ENABLED:
+        stats["hedging"] = hedger.stats()
+    return stats
+
+
+def get_escalation(escalation_id: str):
+    """Return the state of a fast-first escalation (with ``result`` once done), or None."""
+    return escalations.get(escalation_id)
+
+
+@metrics.collector
+def _component_metrics():
+    """Cache, coalescing and scheduler counters, read only when metrics are scraped."""
+    cache = response_cache.stats()
+    coalescing = inflight.stats()
+    upstream = scheduler.stats()
+    families = [
+        ("testgen_cache_lookups_total", "counter", "Response cache lookups by result", [
+            ({"result": "memory_hit"}, cache["memory_hits"]),
+            ({"result": "disk_hit"}, cache["disk_hits"]),
+            ({"result": "miss"}, cache["misses"]),
+        ]),
+        ("testgen_cache_entries", "gauge", "Response cache entries by tier", [
+            ({"tier": "memory"}, cache["memory_entries"]),
+            ({"tier": "disk"}, cache["disk_entries"]),
+        ]),
+        ("testgen_coalesced_total", "counter", "Generations that joined an identical in-flight call",
+         [({}, coalescing["coalesced"])]),
+        ("testgen_upstream_calls_total", "counter", "Groq API attempts by result", [
+            ({"result": "attempt"}, upstream["calls"]),
+            ({"result": "retry"}, upstream["retries"]),
+            ({"result": "rate_limited"}, upstream["rate_limited"]),
+            ({"result": "failure"}, upstream["failures"]),
+        ]),
+        ("testgen_upstream_active", "gauge", "Groq calls holding a concurrency slot", [({}, upstream["active"])]),
+        ("testgen_upstream_concurrency_limit", "gauge", "Current adaptive concurrency limit",
+         [({}, upstream["concurrency_limit"])]),
+    ]
+    if HEDGE_ENABLED:
+        hedging = hedger.stats()
+        families.append(("testgen_hedges_total", "counter", "Hedged Groq requests by result", [
+            ({"result": "sent"}, hedging["hedged"]),
+            ({"result": "won"}, hedging["hedge_wins"]),
+            ({"result": "cancelled"}, hedging["cancelled"]),
+            ({"result": "over_budget"}, hedging["over_budget"]),
+        ]))
+        families.append(("testgen_hedge_delay_seconds", "gauge", "Current wait before a hedge is sent",
+                         [({}, hedging["hedge_delay"])]))
+    routing = escalations.stats()
+    families.append(("testgen_escalations_total", "counter", "Fast-first escalations to the larger model", [
+        ({"result": "started"}, routing["started"]),
+        ({"result": "replaced"}, routing["replaced"]),
+        ({"result": "failed"}, routing["failed"]),
+    ]))
+    if _semantic_index is not None:
+        semantic = _semantic_index.stats()
+        families.append(("testgen_semantic_lookups_total", "counter", "Semantic cache lookups by result", [
+            ({"result": "hit"}, semantic["hits"]),
+            ({"result": "miss"}, semantic["lookups"] - semantic["hits"]),
+        ]))
+    return families
+
+
+def get_metrics() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    return metrics.render()
+
+
+def export_to_excel(test_cases: dict, filename: str = "test_cases.xlsx"):
+    """Export test cases to an Excel file."""
+    try:
+        from exporter import iter_rows, write_excel
+
+        with export_seconds.time(format="excel"):
+            write_excel(iter_rows(test_cases), filename)
+
+        return {"status": "success", "filename": filename}
+    except ImportError:
+        return {"status": "error", "message": "openpyxl not installed. Install with: pip install openpyxl"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def export_to_text(test_cases: dict, filename: str = "test_cases.txt"):
+    """Export test cases to a text file."""
+    try:
+        from exporter import iter_text
+
+        with export_seconds.time(format="text"), open(filename, "w", encoding="utf-8") as f:
+            for chunk in iter_text(test_cases):
+                f.write(chunk)
+
+        return {"status": "success", "filename": filename}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def export_to_csv(test_cases: dict, filename: str = "test_cases.csv"):
+    """Export test cases to a CSV file with title and status."""
+    try:
+        from exporter import iter_csv, iter_rows
+
+        with export_seconds.time(format="csv"), open(filename, "w", newline="", encoding="utf-8") as f:
+            for chunk in iter_csv(iter_rows(test_cases)):
+                f.write(chunk)
+
+        return {"status": "success", "filename": filename}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
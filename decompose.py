@@ -0,0 +1,111 @@
+import re
+
+HEADING = re.compile(
+    r"^\s*("
+    r"#{1,6}\s+\S.*"                       # markdown heading
+    r"|\d+(\.\d+)*[.)]?\s+[A-Z].{0,80}"    # numbered heading: "2.1 Password reset"
+    r"|[A-Z][A-Za-z0-9 /&()'-]{2,80}:"     # "Login Form:"
+    r"|[A-Z0-9][A-Z0-9 /&()'-]{2,80}"      # ALL CAPS line
+    r")\s*$"
+)
+BULLET = re.compile(r"^\s*([-*•]|\d+[.)]|[a-z][.)])\s+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _blocks(text: str):
+    """Split text into (heading, body) blocks at headings and blank lines."""
+    blocks = []
+    heading = None
+    lines = []
+    emitted = False
+
+    def flush():
+        nonlocal emitted
+        body = "\n".join(lines).strip()
+        # A heading with no body of its own is still kept once (e.g. a title)
+        if body or (heading and not emitted):
+            blocks.append((heading, body))
+            emitted = True
+
+    for line in text.splitlines():
+        if HEADING.match(line) and not BULLET.match(line):
+            flush()
+            heading = line.strip()
+            lines = []
+            emitted = False
+        elif not line.strip():
+            # Blank lines end a paragraph, but keep bullet groups together
+            if lines and not BULLET.match(lines[-1]):
+                flush()
+                lines = []
+        else:
+            lines.append(line)
+    flush()
+    return blocks
+
+
+def _split_sentences(text: str, max_tokens: int):
+    chunks = []
+    current = ""
+    for sentence in SENTENCE_END.split(text):
+        candidate = f"{current} {sentence}".strip()
+        if current and estimate_tokens(candidate) > max_tokens:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def segment_module(text: str, max_tokens: int = 600):
+    """Split a long module description into sub-feature segments.
+
+    Segments follow headings first, then paragraphs and bullet groups, and
+    finally sentences, packing neighbours together up to ``max_tokens``.
+    Each block keeps the heading it appeared under.
+    """
+    pieces = []
+    for heading, body in _blocks(text):
+        prefix = f"{heading}\n" if heading else ""
+        block = f"{prefix}{body}".strip()
+        if estimate_tokens(block) <= max_tokens:
+            pieces.append(block)
+            continue
+        for chunk in _split_sentences(body, max_tokens - estimate_tokens(prefix)):
+            pieces.append(f"{prefix}{chunk}".strip())
+
+    segments = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}\n\n{piece}" if current else piece
+        if current and estimate_tokens(candidate) > max_tokens:
+            segments.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        segments.append(current)
+    return segments
+
+
+def module_title(text: str) -> str:
+    """Return the first line of a description when it looks like a title."""
+    for line in text.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line:
+            return line if len(line) <= 120 else ""
+    return ""
+
+
+def with_context(title: str, segment: str) -> str:
+    """Prefix a segment with the module title so it is generated in context."""
+    if not title or segment.lstrip().lstrip("#").strip().startswith(title):
+        return segment
+    return f"{title} - section:\n{segment}"
@@ -0,0 +1,162 @@
+import re
+import zlib
+
+from merge import renumber
+
+WORD = re.compile(r"[a-z0-9]+")
+
+# Smallest prime above 2**32, modulus of the universal hash family
+_PRIME = 4294967311
+_MAX_HASH = (1 << 32) - 1
+# Cases hashed per vectorized chunk (bounds the temporary matrix size)
+_CHUNK_CASES = 2048
+
+
+def case_text(tc: dict) -> str:
+    """The text compared for near-duplicate detection."""
+    steps = tc.get("steps") or []
+    if not isinstance(steps, list):
+        steps = [str(steps)]
+    return " ".join([
+        str(tc.get("title", "")),
+        str(tc.get("scenario", "")),
+        " ".join(str(s) for s in steps),
+        str(tc.get("expected_result", "")),
+    ]).lower()
+
+
+def shingles(text: str, size: int = 3):
+    """Hashed word ``size``-grams of ``text`` (single words for short texts)."""
+    words = WORD.findall(text)
+    if len(words) < size:
+        grams = words or [""]
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+
+def _band_layout(num_perm: int, threshold: float):
+    """Pick (bands, rows) for the LSH index.
+
+    Uses the most selective layout whose S-curve threshold, (1/b)^(1/r),
+    is still below ``threshold``; candidates are verified afterwards, so
+    erring towards recall only costs a few extra comparisons.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1.0 / bands) ** (1.0 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class MinHashIndex:
+    """MinHash signatures with an LSH band index for near-duplicate search.
+
+    Signatures are computed with NumPy in chunks; LSH buckets keep candidate
+    generation roughly linear in the number of documents, so no all-pairs
+    comparison is ever made.
+    """
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.8, seed: int = 1):
+        import numpy as np
+
+        self.np = np
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands, self.rows = _band_layout(num_perm, threshold)
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+    def signatures(self, shingle_sets):
+        """Return a (len(shingle_sets), num_perm) array of MinHash signatures."""
+        np = self.np
+        out = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint64)
+        for start in range(0, len(shingle_sets), _CHUNK_CASES):
+            chunk = shingle_sets[start:start + _CHUNK_CASES]
+            lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+            values = np.fromiter((h for s in chunk for h in s), dtype=np.uint64, count=int(lengths.sum()))
+            hashed = (np.outer(values, self.a) + self.b) % _PRIME
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            out[start:start + len(chunk)] = np.minimum.reduceat(hashed, offsets, axis=0)
+        return np.minimum(out, _MAX_HASH)
+
+    def similarity(self, sig_a, sig_b) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(self.np.count_nonzero(sig_a == sig_b)) / self.num_perm
+
+    def clusters(self, signatures):
+        """Group row indices whose estimated similarity reaches the threshold.
+
+        Returns a list of clusters (lists of indices, smallest index first)
+        containing more than one member.
+        """
+        n = len(signatures)
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        sig32 = signatures.astype(self.np.uint32)
+        for band in range(self.bands):
+            cols = sig32[:, band * self.rows:(band + 1) * self.rows]
+            buckets = {}
+            for i in range(n):
+                buckets.setdefault(cols[i].tobytes(), []).append(i)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                # Verify against the bucket's first member only: linear per bucket
+                head = members[0]
+                for other in members[1:]:
+                    if find(other) == find(head):
+                        continue
+                    if self.similarity(signatures[head], signatures[other]) >= self.threshold:
+                        parent[find(other)] = find(head)
+
+        groups = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        return [sorted(g) for g in groups.values() if len(g) > 1]
+
+
+def find_duplicates(cases, threshold: float = 0.8, num_perm: int = 128):
+    """Return clusters of near-duplicate case indices (first index is kept)."""
+    if len(cases) < 2:
+        return []
+    index = MinHashIndex(num_perm=num_perm, threshold=threshold)
+    signatures = index.signatures([shingles(case_text(tc)) for tc in cases])
+    return index.clusters(signatures)
+
+
+def dedupe_suite(suite: dict, threshold: float = 0.8, renumber_ids: bool = True):
+    """Collapse near-duplicate test cases in ``suite``.
+
+    Returns ``(suite, duplicates)`` where ``duplicates`` maps each kept case
+    ID (before renumbering) to the IDs that were dropped in its favour.
+    """
+    cases = suite.get("test_cases", [])
+    clusters = find_duplicates(cases, threshold)
+    if not clusters:
+        return suite, {}
+
+    dropped = set()
+    duplicates = {}
+    for cluster in clusters:
+        keep = cluster[0]
+        duplicates[cases[keep].get("id")] = [cases[i].get("id") for i in cluster[1:]]
+        dropped.update(cluster[1:])
+
+    kept = [dict(tc) for i, tc in enumerate(cases) if i not in dropped]
+    if renumber_ids:
+        renumber(kept)
+    result = dict(suite)
+    result["test_cases"] = kept
+    result["total_test_cases"] = len(kept)
+    return result, duplicates
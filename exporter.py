@@ -0,0 +1,196 @@
+import csv
+import json
+import zlib
+from io import BytesIO, StringIO
+from itertools import islice
+
+EXPORT_COLUMNS = ["ID", "Title", "Scenario", "Type", "Steps", "Expected Result", "Status"]
+
+EXCEL_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Status colors: (fill, font)
+STATUS_COLORS = {
+    "Passed": ("C6EFCE", "006100"),
+    "Failed": ("FFC7CE", "9C0006"),
+    "Pending": ("FFEB9C", "9C6500"),
+}
+
+# Rows per chunk yielded by the streaming text exporters
+STREAM_CHUNK_ROWS = 500
+
+MAX_COLUMN_WIDTH = 50
+# Column widths are sized from the rows buffered before streaming starts
+WIDTH_SAMPLE_ROWS = 1000
+
+
+def test_case_row(tc: dict):
+    """Flatten one test case into a tuple matching EXPORT_COLUMNS."""
+    return (
+        tc.get("id", ""),
+        tc.get("title", ""),
+        tc.get("scenario", ""),
+        tc.get("type", ""),
+        "; ".join(tc.get("steps", [])),
+        tc.get("expected_result", ""),
+        tc.get("status", "Pending"),
+    )
+
+
+def iter_rows(test_cases: dict):
+    """Yield one export row per test case in a suite."""
+    for tc in test_cases.get("test_cases", []):
+        yield test_case_row(tc)
+
+
+def write_excel(rows, target, sheet_name: str = "Test Cases"):
+    """Stream rows into an .xlsx workbook using openpyxl's write-only mode.
+
+    ``rows`` is any iterable of tuples matching EXPORT_COLUMNS and ``target``
+    is a filename or a binary file object. The first WIDTH_SAMPLE_ROWS rows
+    are buffered to size the columns in the same pass; everything after that
+    is written straight through. Status colors are applied with conditional
+    formatting, so no per-cell style objects are created.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    rows = iter(rows)
+    widths = [len(name) for name in EXPORT_COLUMNS]
+    head = []
+    for row in islice(rows, WIDTH_SAMPLE_ROWS):
+        for i, value in enumerate(row):
+            length = len(value) if isinstance(value, str) else len(str(value))
+            if length > widths[i]:
+                widths[i] = length
+        head.append(row)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+
+    for i, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+    status_col = get_column_letter(EXPORT_COLUMNS.index("Status") + 1)
+    status_range = f"{status_col}2:{status_col}1048576"
+    for status, (fill, font) in STATUS_COLORS.items():
+        ws.conditional_formatting.add(status_range, CellIsRule(
+            operator="equal",
+            formula=[f'"{status}"'],
+            fill=PatternFill(start_color=fill, end_color=fill, fill_type="solid"),
+            font=Font(color=font, bold=True),
+        ))
+
+    header_font = Font(bold=True)
+    header = []
+    for name in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = header_font
+        header.append(cell)
+    ws.append(header)
+
+    for row in head:
+        ws.append(row)
+    for row in rows:
+        ws.append(row)
+
+    wb.save(target)
+    return target
+
+
+def excel_bytes(test_cases: dict) -> bytes:
+    """Render a suite as .xlsx and return the workbook bytes."""
+    buffer = BytesIO()
+    write_excel(iter_rows(test_cases), buffer)
+    return buffer.getvalue()
+
+
+def iter_csv(rows, header: bool = True):
+    """Yield CSV text in chunks of STREAM_CHUNK_ROWS rows."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % STREAM_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    tail = buffer.getvalue()
+    if tail:
+        yield tail
+
+
+def iter_ndjson(test_cases: dict):
+    """Yield one JSON line per test case, in chunks of STREAM_CHUNK_ROWS lines."""
+    lines = []
+    for tc in test_cases.get("test_cases", []):
+        lines.append(json.dumps(tc))
+        if len(lines) == STREAM_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_text(test_cases: dict):
+    """Yield a human-readable text rendering of a suite, one test case per chunk."""
+    yield (
+        f"MODULE: {test_cases.get('module', 'N/A')}\n"
+        f"Total Test Cases: {test_cases.get('total_test_cases', 0)}\n"
+        + "=" * 80 + "\n\n"
+    )
+    for tc in test_cases.get("test_cases", []):
+        lines = [
+            f"Test Case ID: {tc.get('id', '')}",
+            f"Title: {tc.get('title', '')}",
+            f"Scenario: {tc.get('scenario', '')}",
+            f"Type: {tc.get('type', '')}",
+            "Steps:",
+        ]
+        for i, step in enumerate(tc.get("steps", []), 1):
+            lines.append(f"  {i}. {step}")
+        lines.append(f"Expected Result: {tc.get('expected_result', '')}")
+        lines.append(f"Status: {tc.get('status', 'Pending')}")
+        lines.append("-" * 80)
+        yield "\n".join(lines) + "\n\n"
+
+
+# format -> (mimetype, filename)
+EXPORT_FORMATS = {
+    "json": ("application/json", "test_cases.json"),
+    "csv": ("text/csv", "test_cases.csv"),
+    "ndjson": ("application/x-ndjson", "test_cases.ndjson"),
+    "excel": (EXCEL_MIMETYPE, "test_cases.xlsx"),
+    "text": ("text/plain", "test_cases.txt"),
+}
+
+
+def render_export(test_cases: dict, fmt: str) -> bytes:
+    """Render a suite in one of EXPORT_FORMATS and return the bytes."""
+    if fmt == "json":
+        return json.dumps(test_cases, indent=2).encode("utf-8")
+    if fmt == "csv":
+        return "".join(iter_csv(iter_rows(test_cases))).encode("utf-8")
+    if fmt == "ndjson":
+        return "".join(iter_ndjson(test_cases)).encode("utf-8")
+    if fmt == "excel":
+        return excel_bytes(test_cases)
+    if fmt == "text":
+        return "".join(iter_text(test_cases)).encode("utf-8")
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def gzip_chunks(chunks, level: int = 6):
+    """Compress a stream of text chunks into a single gzip stream."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
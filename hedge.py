@@ -0,0 +1,160 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct: float):
+        """Return the ``pct`` percentile of the window, or None when it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round((len(samples) - 1) * pct / 100.0)))
+        return samples[index]
+
+
+class Cancelled(Exception):
+    """Raised by an attempt that stopped because the other attempt already won."""
+
+
+class Hedger:
+    """Send a duplicate request when the first one is slower than usual.
+
+    If no response has arrived after the ``percentile`` of recent latencies
+    (at least ``min_delay``), the same call is fired again and whichever
+    finishes first wins. Each attempt runs ``fn(settled)``; ``settled`` is
+    set as soon as an attempt succeeds (``fn`` may set it itself), so the
+    other attempt can skip or abort its request by raising ``Cancelled``. A
+    hedge that has not started yet is never run. Hedges are capped at
+    ``max_rate`` times the number of calls.
+    """
+
+    def __init__(self, percentile: float = 95.0, max_rate: float = 0.1, min_delay: float = 0.5,
+                 min_samples: int = 20, window: int = 200, max_workers: int = 32):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.latency = LatencyTracker(window)
+        self._lock = threading.Lock()
+        self._pool = None
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.cancelled = 0
+        self.over_budget = 0
+
+    def delay(self):
+        """Seconds to wait before hedging, or None while there is too little history."""
+        if len(self.latency) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_rate * self.calls:
+                self.over_budget += 1
+                return False
+            self.hedged += 1
+            return True
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+            return self._pool
+
+    def call(self, fn):
+        """Run ``fn(settled)``, hedging it with a second attempt if it is slow."""
+        with self._lock:
+            self.calls += 1
+        settled = threading.Event()
+        delay = self.delay()
+        if delay is None:
+            start = time.perf_counter()
+            result = fn(settled)
+            self.latency.add(time.perf_counter() - start)
+            return result
+
+        outcomes = queue.Queue()
+
+        def attempt(label):
+            # A hedge that is still queued when the other attempt wins is never sent
+            if settled.is_set():
+                with self._lock:
+                    self.cancelled += 1
+                return
+            start = time.perf_counter()
+            try:
+                result = fn(settled)
+            except Cancelled:
+                with self._lock:
+                    self.cancelled += 1
+                return
+            except BaseException as e:
+                outcomes.put((label, False, e))
+                return
+            settled.set()
+            self.latency.add(time.perf_counter() - start)
+            outcomes.put((label, True, result))
+
+        pool = self._get_pool()
+        futures = [pool.submit(attempt, "primary")]
+        try:
+            first = outcomes.get(timeout=delay)
+        except queue.Empty:
+            first = None
+            if self._take_budget():
+                futures.append(pool.submit(attempt, "hedge"))
+
+        pending = len(futures) - (first is not None)
+        while True:
+            if first is None:
+                first = outcomes.get()
+                pending -= 1
+            label, ok, value = first
+            if ok:
+                settled.set()
+                for future in futures:
+                    if future.cancel():
+                        with self._lock:
+                            self.cancelled += 1
+                if label == "hedge":
+                    with self._lock:
+                        self.hedge_wins += 1
+                return value
+            if not pending:
+                raise value
+            first = None
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "cancelled": self.cancelled,
+                "over_budget": self.over_budget,
+                "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            }
+        delay = self.delay()
+        stats["hedge_delay"] = round(delay, 3) if delay is not None else None
+        return stats
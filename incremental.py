@@ -0,0 +1,115 @@
+import hashlib
+import re
+from collections import Counter
+
+from cache import normalize_module_text
+from decompose import _blocks, estimate_tokens
+
+WORD = re.compile(r"[a-z0-9]+")
+CASE_NUMBER = re.compile(r"(\d+)\s*$")
+
+
+def section_key(text: str) -> str:
+    """Content hash of a section, insensitive to whitespace changes."""
+    return hashlib.sha256(normalize_module_text(text).lower().encode("utf-8")).hexdigest()[:16]
+
+
+def module_sections(text: str, max_tokens: int = 600):
+    """Split a description into the sections that are regenerated independently.
+
+    Headings delimit sections; a description without headings (or one long
+    section) is split into its paragraphs and bullet groups instead, so an
+    edit only invalidates the part it touches. Returns ``[(key, text)]``;
+    repeated sections get distinct keys.
+    """
+    groups = []
+    for heading, body in _blocks(text):
+        if groups and groups[-1][0] == heading:
+            groups[-1][1].append(body)
+        elif groups and not any(groups[-1][1]):
+            # A heading without text of its own (e.g. the title) leads the next section
+            groups[-1] = (f"{groups[-1][0]}\n{heading}" if heading else groups[-1][0], [body])
+        else:
+            groups.append((heading, [body]))
+    sections = [
+        "\n".join(filter(None, [heading] + bodies)).strip() for heading, bodies in groups
+    ]
+    if len(sections) == 1 and estimate_tokens(sections[0]) > max_tokens:
+        sections = [f"{heading}\n{body}".strip() if heading else body for heading, body in _blocks(text)]
+
+    keyed = []
+    seen = Counter()
+    for section in filter(None, sections):
+        key = section_key(section)
+        seen[key] += 1
+        keyed.append((key if seen[key] == 1 else f"{key}-{seen[key]}", section))
+    return keyed
+
+
+def _case_words(tc: dict):
+    steps = tc.get("steps") or []
+    if not isinstance(steps, list):
+        steps = [str(steps)]
+    text = " ".join([str(tc.get("title", "")), str(tc.get("scenario", ""))] + [str(s) for s in steps])
+    return set(WORD.findall(text.lower()))
+
+
+def attribute_cases(suite: dict, sections):
+    """Map each section key to the IDs of the suite's test cases it produced.
+
+    Uses the suite's own ``sections`` map when it has one (suites made by
+    incremental regeneration). Otherwise every case is assigned to the
+    section sharing the most distinctive words with it, words found in fewer
+    sections counting more; cases sharing none go to the first section.
+    """
+    recorded = suite.get("sections")
+    if isinstance(recorded, dict):
+        return {key: list(ids) for key, ids in recorded.items()}
+
+    section_words = {key: set(WORD.findall(text.lower())) for key, text in sections}
+    document_frequency = Counter(word for words in section_words.values() for word in words)
+    attribution = {key: [] for key, _ in sections}
+    for tc in suite.get("test_cases", []):
+        words = _case_words(tc)
+        best, best_score = sections[0][0] if sections else None, 0.0
+        for key, _ in sections:
+            score = sum(1.0 / document_frequency[w] for w in words & section_words[key])
+            if score > best_score:
+                best, best_score = key, score
+        if best is not None:
+            attribution[best].append(tc.get("id"))
+    return attribution
+
+
+def plan_regeneration(previous: dict, module: str, max_tokens: int = 600, previous_description: str = None):
+    """Compare a new description with the one ``previous`` was generated from.
+
+    The old description is ``previous_description``, else the suite's
+    ``description``, else its ``module`` field. Returns the new sections, the
+    previous cases to keep per unchanged section (``{key: [case]}``) and the
+    keys of the changed and removed sections.
+    """
+    sections = module_sections(module, max_tokens)
+    if previous_description is None:
+        previous_description = previous.get("description") or previous.get("module", "")
+    old_sections = module_sections(previous_description, max_tokens)
+    attribution = attribute_cases(previous, old_sections)
+    cases_by_id = {tc.get("id"): tc for tc in previous.get("test_cases", [])}
+
+    kept = {}
+    changed = []
+    for key, _ in sections:
+        if key in attribution:
+            kept[key] = [cases_by_id[i] for i in attribution[key] if i in cases_by_id]
+        else:
+            changed.append(key)
+    current = {key for key, _ in sections}
+    removed = [key for key, _ in old_sections if key not in current]
+    return {"sections": sections, "kept": kept, "changed": changed, "removed": removed}
+
+
+def next_case_number(suite: dict) -> int:
+    """First TC number not used by any case of ``suite``."""
+    numbers = [int(m.group(1)) for m in (CASE_NUMBER.search(str(tc.get("id", ""))) for tc in
+               suite.get("test_cases", [])) if m]
+    return max(numbers, default=0) + 1
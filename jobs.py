@@ -0,0 +1,252 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+FINAL_STATUSES = ("done", "failed", "cancelled")
+
+
+class JobQueue:
+    """SQLite-backed priority queue of generation jobs with a local worker pool.
+
+    Jobs are claimed highest priority first, then oldest first. A running job
+    holds a lease that its worker keeps renewing; when a process dies, its
+    jobs' leases expire and another worker (in this or a later process)
+    picks them up again, up to ``max_attempts`` times. Cancelling a queued job
+    removes it from the queue; cancelling a running job discards its result.
+    """
+
+    def __init__(self, path="jobs.db", handler=None, workers=2, lease=60.0, max_attempts=3,
+                 retention=7 * 24 * 3600):
+        self.path = path
+        self.handler = handler
+        self.workers = workers
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._conn = None
+        self._threads = []
+        self._running = set()
+        self._stopped = threading.Event()
+
+    def _db(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " priority INTEGER NOT NULL DEFAULT 0,"
+                " payload TEXT NOT NULL,"
+                " result TEXT,"
+                " error TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " lease_until REAL,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority, created_at)")
+            self._conn.commit()
+        return self._conn
+
+    def start(self):
+        """Start the worker threads (and the lease keeper) once."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            keeper = threading.Thread(target=self._keep_leases, name="job-leases", daemon=True)
+            keeper.start()
+            self._threads.append(keeper)
+
+    def stop(self):
+        self._stopped.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def submit(self, payload: dict, priority: int = 0) -> str:
+        """Queue a job and return its ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT INTO jobs (id, status, priority, payload, created_at) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, int(priority), json.dumps(payload), now),
+            )
+            db.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND finished_at < ?",
+                (now - self.retention,),
+            )
+            db.commit()
+        with self._changed:
+            self._changed.notify_all()
+        return job_id
+
+    def _row(self, job_id: str):
+        with self._lock:
+            return self._db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    @staticmethod
+    def _public(row, include_result=True):
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "module": json.loads(row["payload"]).get("module"),
+            "attempts": row["attempts"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+        if row["error"]:
+            job["error"] = row["error"]
+        if include_result and row["result"]:
+            job["result"] = json.loads(row["result"])
+        return job
+
+    def get(self, job_id: str):
+        """Return a job (with its result once done) or None."""
+        row = self._row(job_id)
+        return self._public(row) if row is not None else None
+
+    def wait(self, job_id: str, timeout: float):
+        """Block until the job is finished or ``timeout`` seconds pass, then return it."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in FINAL_STATUSES or remaining <= 0:
+                return job
+            # Local completions notify; other processes' are seen by polling
+            with self._changed:
+                self._changed.wait(min(remaining, 0.5))
+
+    def list(self, status: str = None, limit: int = 50):
+        """Return the most recent jobs (without results), optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db().execute(query, params).fetchall()
+        return [self._public(row, include_result=False) for row in rows]
+
+    def cancel(self, job_id: str):
+        """Cancel a queued or running job; returns the job, or None if unknown."""
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, lease_until = NULL"
+                " WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            )
+            db.commit()
+        with self._changed:
+            self._changed.notify_all()
+        return self.get(job_id)
+
+    def _claim(self):
+        """Atomically take the next queued (or abandoned running) job."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            while True:
+                row = db.execute(
+                    "SELECT id, attempts FROM jobs"
+                    " WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)"
+                    " ORDER BY priority DESC, created_at ASC LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["attempts"] >= self.max_attempts:
+                    db.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, lease_until = NULL"
+                        " WHERE id = ?",
+                        (f"Gave up after {row['attempts']} attempts", now, row["id"]),
+                    )
+                    db.commit()
+                    continue
+                # The status/lease check makes the claim safe across processes too
+                claimed = db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, started_at = ?"
+                    " WHERE id = ? AND (status = 'queued' OR (status = 'running' AND lease_until < ?))",
+                    (now + self.lease, now, row["id"], now),
+                ).rowcount
+                db.commit()
+                if claimed:
+                    self._running.add(row["id"])
+                    job = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                    return job
+
+    def _finish(self, job_id: str, result=None, error=None):
+        with self._lock:
+            self._running.discard(job_id)
+            db = self._db()
+            # A job cancelled while running keeps its cancelled status
+            db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL"
+                " WHERE id = ? AND status = 'running'",
+                (
+                    "failed" if error else "done",
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                ),
+            )
+            db.commit()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _work(self):
+        while not self._stopped.is_set():
+            job = self._claim()
+            if job is None:
+                with self._changed:
+                    self._changed.wait(1.0)
+                continue
+            try:
+                result = self.handler(json.loads(job["payload"]))
+            except Exception as e:
+                self._finish(job["id"], error=str(e))
+                continue
+            if isinstance(result, dict) and "error" in result:
+                self._finish(job["id"], error=str(result["error"]))
+            else:
+                self._finish(job["id"], result=result)
+
+    def _keep_leases(self):
+        while not self._stopped.wait(self.lease / 3):
+            with self._lock:
+                if not self._running:
+                    continue
+                db = self._db()
+                db.executemany(
+                    "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running'",
+                    [(time.time() + self.lease, job_id) for job_id in self._running],
+                )
+                db.commit()
+
+    def stats(self):
+        """Return the number of jobs per status."""
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
@@ -0,0 +1,50 @@
+import re
+
+from repair import normalize_suite
+
+
+def _dedupe_key(tc: dict):
+    def norm(value):
+        return re.sub(r"\W+", " ", str(value or "")).strip().lower()
+    return norm(tc.get("title")), norm(tc.get("scenario"))
+
+
+def renumber(cases, start: int = 1):
+    """Assign sequential TC-### IDs to ``cases`` in place."""
+    for n, tc in enumerate(cases, start):
+        tc["id"] = f"TC-{n:03d}"
+    return cases
+
+
+def merge_suites(module: str, suites, labels=None):
+    """Merge several partial suites into one.
+
+    Test cases whose normalized title and scenario repeat an earlier case
+    are dropped, IDs are renumbered globally and ``total_test_cases`` is
+    recomputed. Repairs reported by the parts are carried over, prefixed with
+    the part's label when ``labels`` is given.
+    """
+    merged = []
+    seen = set()
+    repairs = []
+    duplicates = 0
+
+    for i, suite in enumerate(suites):
+        label = labels[i] if labels else None
+        for note in suite.get("repairs", []):
+            repairs.append(f"{label}: {note}" if label else note)
+        for tc in suite.get("test_cases", []):
+            key = _dedupe_key(tc)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            merged.append(dict(tc))
+
+    result = {"module": module, "total_test_cases": len(merged), "test_cases": renumber(merged)}
+    normalize_suite(result, module)
+    if duplicates:
+        repairs.append(f"removed {duplicates} duplicate test cases while merging")
+    if repairs:
+        result["repairs"] = repairs
+    return result
@@ -0,0 +1,229 @@
+import random
+import threading
+import time
+
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+
+class UpstreamRateLimited(Exception):
+    """Raised when the upstream keeps rate limiting after every retry."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` per second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1):
+        """Block until ``amount`` tokens are available, then take them."""
+        # Requests larger than the bucket would never fit; let them drain it
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def adjust(self, delta: float):
+        """Return (positive) or charge (negative) tokens after the fact."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the upstream reported a rate limit."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0)
+
+
+def get_retry_after(error):
+    """Read a Retry-After hint (seconds) from an SDK exception, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+class AdaptiveScheduler:
+    """Client-side scheduler for upstream LLM calls.
+
+    Every call waits for a request token (requests per minute), an estimate of
+    its token usage (tokens per minute) and a concurrency slot. Concurrency is
+    adjusted AIMD-style: it grows by one slot per window of successes and is
+    halved whenever the upstream answers 429. Rate limits and transient
+    failures are retried with jittered exponential backoff, honoring any
+    Retry-After hint.
+    """
+
+    def __init__(self, rpm=30, tpm=20000, max_concurrency=8, max_retries=5,
+                 base_delay=0.5, max_delay=30.0, transient_errors=(), cancelled_errors=()):
+        self.request_bucket = TokenBucket(rpm, rpm / 60.0) if rpm else None
+        self.token_bucket = TokenBucket(tpm, tpm / 60.0) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.transient_errors = tuple(transient_errors)
+        # Raised by callers that gave up on purpose: re-raised, not counted as failures
+        self.cancelled_errors = tuple(cancelled_errors)
+        self._cond = threading.Condition()
+        self._active = 0
+        self._blocked_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    def _acquire_slot(self):
+        with self._cond:
+            while self._active >= int(self.concurrency):
+                self._cond.wait()
+            self._active += 1
+
+    def _release_slot(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _on_success(self):
+        with self._cond:
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+            self._cond.notify_all()
+
+    def _on_rate_limited(self, retry_after):
+        with self._cond:
+            self.rate_limited += 1
+            self.concurrency = max(1.0, self.concurrency / 2)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        if self.request_bucket:
+            self.request_bucket.drain()
+
+    def _wait_if_blocked(self):
+        delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _backoff(self, attempt, retry_after):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, delay)  # full jitter
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _classify(self, error):
+        status = getattr(error, "status_code", None)
+        if status == 429:
+            return "rate_limited"
+        if status in RETRYABLE_STATUS_CODES or (status is not None and status >= 500):
+            return "transient"
+        if self.transient_errors and isinstance(error, self.transient_errors):
+            return "transient"
+        return None
+
+    def _settle_tokens(self, estimated_tokens, actual_tokens):
+        if self.token_bucket and actual_tokens is not None:
+            self.token_bucket.adjust(min(estimated_tokens, self.token_bucket.capacity) - actual_tokens)
+
+    def _releaser(self, estimated_tokens):
+        released = threading.Lock()
+
+        def release(actual_tokens=None):
+            if released.acquire(blocking=False):
+                self._release_slot()
+                self._settle_tokens(estimated_tokens, actual_tokens)
+
+        return release
+
+    def call(self, fn, estimated_tokens: int = 0, usage_tokens=None, hold_slot: bool = False):
+        """Run ``fn()`` under the rate limits, retrying retryable failures.
+
+        ``usage_tokens(result)`` may return the actual token count so the
+        tokens-per-minute bucket can be corrected after the call. With
+        ``hold_slot`` (e.g. a streamed response), ``(result, release)`` is
+        returned and the concurrency slot stays taken until
+        ``release(actual_tokens)`` is called.
+        """
+        attempt = 0
+        while True:
+            self._wait_if_blocked()
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket and estimated_tokens:
+                self.token_bucket.acquire(estimated_tokens)
+
+            self._acquire_slot()
+            held = False
+            try:
+                self.calls += 1
+                result = fn()
+            except self.cancelled_errors:
+                raise
+            except Exception as e:
+                kind = self._classify(e)
+                retry_after = get_retry_after(e)
+                if kind == "rate_limited":
+                    self._on_rate_limited(retry_after)
+                if kind is None or attempt >= self.max_retries:
+                    self.failures += 1
+                    if kind == "rate_limited":
+                        raise UpstreamRateLimited(str(e), retry_after) from e
+                    raise
+            else:
+                self._on_success()
+                if hold_slot:
+                    held = True
+                    return result, self._releaser(estimated_tokens)
+                self._settle_tokens(estimated_tokens, usage_tokens(result) if usage_tokens else None)
+                return result
+            finally:
+                if not held:
+                    self._release_slot()
+
+            self.retries += 1
+            time.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    def stats(self):
+        """Return call/retry counters and the current concurrency limit."""
+        with self._cond:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "failures": self.failures,
+                "concurrency_limit": int(self.concurrency),
+                "active": self._active,
+            }
@@ -0,0 +1,250 @@
+import json
+import re
+
+from stream_parser import TestCaseStreamParser
+
+TEST_CASE_TYPES = ("Functional", "Negative", "Boundary", "Security")
+TEST_CASE_STATUSES = ("Pending", "Passed", "Failed")
+
+# Loose labels the model uses, mapped onto the four canonical types
+TYPE_ALIASES = {
+    "functional": "Functional",
+    "positive": "Functional",
+    "happy path": "Functional",
+    "negative": "Negative",
+    "validation": "Negative",
+    "error handling": "Negative",
+    "boundary": "Boundary",
+    "edge": "Boundary",
+    "edge case": "Boundary",
+    "limit": "Boundary",
+    "security": "Security",
+}
+
+FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+ID_PATTERN = re.compile(r"^TC-\d{3,}$")
+MODULE_FIELD = re.compile(r'"module"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove markdown fences and any prose around the outermost JSON object."""
+    match = FENCE.search(text)
+    if match:
+        text = match.group(1)
+    elif text.lstrip().startswith("```"):
+        # Opening fence without a closing one (truncated output)
+        text = text.lstrip()[3:]
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1:
+        return text.strip()
+    if end > start:
+        return text[start:end + 1]
+    return text[start:]
+
+
+def has_wrapping(text: str) -> bool:
+    """Whether ``text`` has markdown fences or prose around its JSON object.
+
+    Text cut off after the last closing brace of a truncated object is not
+    prose, so it does not count.
+    """
+    text = text.strip()
+    if text.startswith("```") or FENCE.search(text):
+        return True
+    start = text.find("{")
+    if start != 0:
+        return start > 0
+    fixed = fix_common_errors(text)
+    try:
+        _, end = json.JSONDecoder().raw_decode(fixed)
+    except json.JSONDecodeError:
+        return False
+    return bool(fixed[end:].strip())
+
+
+def _outside_strings(text: str, fix):
+    """Apply ``fix`` to every run of text that is not inside a JSON string."""
+    parts = []
+    i = 0
+    start = 0
+    in_string = False
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            if ch == "\\":
+                i += 1
+            elif ch == '"':
+                in_string = False
+                parts.append(text[start:i + 1])
+                start = i + 1
+        elif ch == '"':
+            parts.append(fix(text[start:i]))
+            start = i
+            in_string = True
+        i += 1
+    tail = text[start:]
+    parts.append(tail if in_string else fix(tail))
+    return "".join(parts)
+
+
+def _fix_syntax(segment: str) -> str:
+    segment = TRAILING_COMMA.sub(r"\1", segment)
+    segment = re.sub(r"\bTrue\b", "true", segment)
+    segment = re.sub(r"\bFalse\b", "false", segment)
+    segment = re.sub(r"\bNone\b", "null", segment)
+    return segment
+
+
+def fix_common_errors(text: str) -> str:
+    """Fix trailing commas and Python-style literals outside of strings."""
+    return _outside_strings(text, _fix_syntax)
+
+
+def recover_test_cases(text: str):
+    """Return every complete test case object found in possibly truncated text."""
+    parser = TestCaseStreamParser()
+    return parser.feed(text)
+
+
+def normalize_type(value) -> str:
+    """Map a free-form type label onto one of TEST_CASE_TYPES."""
+    if not isinstance(value, str):
+        return "Functional"
+    label = value.strip()
+    if label in TEST_CASE_TYPES:
+        return label
+    lowered = label.lower()
+    for suffix in (" test cases", " test case", " tests", " test", " cases", " case"):
+        if lowered.endswith(suffix):
+            lowered = lowered[: -len(suffix)]
+            break
+    if lowered in TYPE_ALIASES:
+        return TYPE_ALIASES[lowered]
+    # "Functional | Negative" style answers copied from the template
+    for part in re.split(r"[|/,]", lowered):
+        part = part.strip()
+        if part in TYPE_ALIASES:
+            return TYPE_ALIASES[part]
+    return "Functional"
+
+
+def normalize_status(value) -> str:
+    """Map a status label onto one of TEST_CASE_STATUSES (default Pending)."""
+    if isinstance(value, str):
+        for status in TEST_CASE_STATUSES:
+            if value.strip().lower() == status.lower():
+                return status
+    return "Pending"
+
+
+def normalize_suite(suite: dict, module: str = None):
+    """Normalize IDs, types, statuses, steps and totals in place.
+
+    Returns a list of human-readable notes describing what was changed.
+    """
+    repairs = []
+
+    if module is not None and not suite.get("module"):
+        suite["module"] = module
+        repairs.append("filled missing module")
+
+    cases = suite.get("test_cases")
+    if not isinstance(cases, list):
+        cases = []
+        repairs.append("missing test_cases list")
+    kept = [tc for tc in cases if isinstance(tc, dict)]
+    if len(kept) != len(cases):
+        repairs.append(f"dropped {len(cases) - len(kept)} non-object test cases")
+    cases = kept
+
+    ids = [tc.get("id") for tc in cases]
+    valid_ids = all(isinstance(i, str) and ID_PATTERN.match(i) for i in ids)
+    if not valid_ids or len(set(ids)) != len(ids):
+        for n, tc in enumerate(cases, 1):
+            tc["id"] = f"TC-{n:03d}"
+        repairs.append("renumbered test case IDs")
+
+    fixed_types = fixed_statuses = fixed_steps = 0
+    for tc in cases:
+        tc_type = normalize_type(tc.get("type"))
+        if tc_type != tc.get("type"):
+            tc["type"] = tc_type
+            fixed_types += 1
+        status = normalize_status(tc.get("status"))
+        if status != tc.get("status"):
+            tc["status"] = status
+            fixed_statuses += 1
+        steps = tc.get("steps")
+        if not isinstance(steps, list):
+            if isinstance(steps, str) and steps.strip():
+                steps = [s.strip() for s in re.split(r"\n|;", steps) if s.strip()]
+            else:
+                steps = []
+            tc["steps"] = steps
+            fixed_steps += 1
+        elif not all(isinstance(s, str) for s in steps):
+            tc["steps"] = [str(s) for s in steps]
+            fixed_steps += 1
+        for field in ("title", "scenario", "expected_result"):
+            if not isinstance(tc.get(field), str):
+                tc[field] = "" if tc.get(field) is None else str(tc[field])
+
+    if fixed_types:
+        repairs.append(f"normalized {fixed_types} type values")
+    if fixed_statuses:
+        repairs.append(f"normalized {fixed_statuses} status values")
+    if fixed_steps:
+        repairs.append(f"normalized steps for {fixed_steps} test cases")
+
+    suite["test_cases"] = cases
+    if suite.get("total_test_cases") != len(cases):
+        suite["total_test_cases"] = len(cases)
+        repairs.append("corrected total_test_cases")
+
+    return repairs
+
+
+def repair_model_output(text: str, module: str = None):
+    """Parse model output, salvaging what it can from malformed JSON.
+
+    Returns ``(suite, repairs)``; ``suite`` is None when nothing usable was
+    found. ``repairs`` lists the fixes that were applied.
+    """
+    repairs = []
+    suite = None
+
+    try:
+        suite = json.loads(text)
+    except json.JSONDecodeError:
+        cleaned = strip_code_fences(text)
+        if has_wrapping(text):
+            repairs.append("stripped markdown/prose around JSON")
+        try:
+            suite = json.loads(cleaned)
+        except json.JSONDecodeError:
+            fixed = fix_common_errors(cleaned)
+            try:
+                suite = json.loads(fixed)
+                repairs.append("fixed JSON syntax errors")
+            except json.JSONDecodeError:
+                cases = recover_test_cases(fixed)
+                if cases:
+                    found = MODULE_FIELD.search(fixed)
+                    suite = {
+                        "module": json.loads(f'"{found.group(1)}"') if found else module,
+                        "test_cases": cases,
+                    }
+                    repairs.append(f"recovered {len(cases)} complete test cases from truncated output")
+
+    if isinstance(suite, list):
+        suite = {"module": module, "test_cases": suite}
+        repairs.append("wrapped bare test case list")
+    if not isinstance(suite, dict):
+        return None, repairs
+
+    repairs.extend(normalize_suite(suite, module))
+    if not suite["test_cases"]:
+        return None, repairs
+    return suite, repairs
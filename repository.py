@@ -0,0 +1,237 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+TERM = re.compile(r"(\w+)(\*?)", re.UNICODE)
+
+# Filterable columns and the query parameters that select them
+FILTERS = ("type", "status", "module", "suite_id")
+# Filters that are also indexed in the full-text table, so text searches
+# narrow by them inside FTS5 instead of row by row
+FACETS = ("type", "status")
+
+
+def fts_query(text: str):
+    """Turn free text into an FTS5 query over the text columns.
+
+    Every word must match; ``word*`` matches a prefix.
+    """
+    terms = [f'"{word}"{star}' for word, star in TERM.findall(text.lower())]
+    if not terms:
+        return None
+    return "{title scenario steps expected_result} : (" + " ".join(terms) + ")"
+
+
+def _facet(name: str, value) -> str:
+    """Single FTS token for a filter value, e.g. "typenegative"."""
+    return re.sub(r"\W+", "", f"{name}{value}".lower()) if value else ""
+
+
+class CaseRepository:
+    """Searchable history of every stored suite and its test cases.
+
+    Suites are keyed by suite ID, so adding one twice is a no-op. When a suite
+    replaces an earlier one, the earlier suite's cases leave the search.
+    ``cursor`` is the last row ID of the previous page (newest first).
+    """
+
+    def __init__(self, path="repository.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS suites ("
+                " id TEXT PRIMARY KEY,"
+                " module TEXT,"
+                " total_test_cases INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " replaced_by TEXT);"
+                "CREATE TABLE IF NOT EXISTS cases ("
+                " id INTEGER PRIMARY KEY,"
+                " suite_id TEXT NOT NULL,"
+                " case_id TEXT,"
+                " module TEXT COLLATE NOCASE,"
+                " type TEXT COLLATE NOCASE,"
+                " status TEXT COLLATE NOCASE,"
+                " title TEXT,"
+                " scenario TEXT,"
+                " steps TEXT,"
+                " expected_result TEXT,"
+                " created_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_type ON cases (type, id);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_status ON cases (status, id);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_type_status ON cases (type, status, id);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_module ON cases (module, id);"
+                "CREATE INDEX IF NOT EXISTS idx_cases_suite ON cases (suite_id, id);"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5("
+                " title, scenario, steps, expected_result, facets, content='', tokenize='unicode61');"
+            )
+            if "replaced_by" not in {row["name"] for row in conn.execute("PRAGMA table_info(suites)")}:
+                # Repositories created before suites could be replaced
+                conn.execute("ALTER TABLE suites ADD COLUMN replaced_by TEXT")
+            self._conn = conn
+        return self._conn
+
+    def add_suites(self, suites) -> int:
+        """Store suites in one transaction; returns the number of cases added.
+
+        Each item is ``(suite_id, suite)`` or ``(suite_id, suite, replaces)``,
+        where ``replaces`` is the ID of the suite this one supersedes.
+        """
+        now = time.time()
+        added = 0
+        with self._lock:
+            db = self._db()
+            with db:
+                for suite_id, suite, *replaces in suites:
+                    replaces = replaces[0] if replaces else None
+                    cases = [tc for tc in suite.get("test_cases", []) if isinstance(tc, dict)]
+                    existing = db.execute("SELECT replaced_by FROM suites WHERE id = ?", (suite_id,)).fetchone()
+                    if existing is None:
+                        db.execute(
+                            "INSERT INTO suites (id, module, total_test_cases, created_at) VALUES (?, ?, ?, ?)",
+                            (suite_id, suite.get("module"), len(cases), now),
+                        )
+                        added += self._insert_cases(db, suite_id, suite, cases, now)
+                    elif existing["replaced_by"] is not None and replaces:
+                        # Going back to an earlier version makes it current again
+                        db.execute("UPDATE suites SET replaced_by = NULL WHERE id = ?", (suite_id,))
+                        added += self._insert_cases(db, suite_id, suite, cases, now)
+                    if replaces and replaces != suite_id:
+                        self._retire(db, replaces, suite_id)
+        return added
+
+    def add_suite(self, suite_id: str, suite: dict, replaces: str = None) -> int:
+        return self.add_suites([(suite_id, suite, replaces)])
+
+    @staticmethod
+    def _insert_cases(db, suite_id: str, suite: dict, cases, now: float) -> int:
+        if not cases:
+            return 0
+        first = (db.execute("SELECT MAX(id) FROM cases").fetchone()[0] or 0) + 1
+        rows = []
+        texts = []
+        for offset, tc in enumerate(cases):
+            steps = tc.get("steps") or []
+            if not isinstance(steps, list):
+                steps = [str(steps)]
+            steps = [str(s) for s in steps]
+            rows.append((
+                first + offset, suite_id, tc.get("id"), suite.get("module"), tc.get("type"),
+                tc.get("status"), tc.get("title"), tc.get("scenario"), json.dumps(steps),
+                tc.get("expected_result"), now,
+            ))
+            facets = " ".join(_facet(name, tc.get(name)) for name in FACETS)
+            texts.append((first + offset, tc.get("title"), tc.get("scenario"), "\n".join(steps),
+                          tc.get("expected_result"), facets))
+        db.executemany(
+            "INSERT INTO cases (id, suite_id, case_id, module, type, status, title, scenario, steps,"
+            " expected_result, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        db.executemany(
+            "INSERT INTO cases_fts (rowid, title, scenario, steps, expected_result, facets) VALUES (?, ?, ?, ?, ?, ?)",
+            texts,
+        )
+        return len(rows)
+
+    @staticmethod
+    def _retire(db, suite_id: str, replaced_by: str):
+        """Mark a suite as replaced and remove its cases from the search."""
+        retired = db.execute(
+            "UPDATE suites SET replaced_by = ? WHERE id = ? AND replaced_by IS NULL", (replaced_by, suite_id)
+        ).rowcount
+        if not retired:
+            return
+        rows = db.execute(
+            "SELECT id, type, status, title, scenario, steps, expected_result FROM cases WHERE suite_id = ?",
+            (suite_id,),
+        ).fetchall()
+        # A contentless FTS5 row is deleted by passing back the values it was indexed with
+        db.executemany(
+            "INSERT INTO cases_fts (cases_fts, rowid, title, scenario, steps, expected_result, facets)"
+            " VALUES ('delete', ?, ?, ?, ?, ?, ?)",
+            [
+                (row["id"], row["title"], row["scenario"], "\n".join(json.loads(row["steps"] or "[]")),
+                 row["expected_result"], " ".join(_facet(name, row[name]) for name in FACETS))
+                for row in rows
+            ],
+        )
+        db.execute("DELETE FROM cases WHERE suite_id = ?", (suite_id,))
+
+    @staticmethod
+    def _public(row):
+        return {
+            "id": row["case_id"],
+            "title": row["title"],
+            "scenario": row["scenario"],
+            "type": row["type"],
+            "steps": json.loads(row["steps"]) if row["steps"] else [],
+            "expected_result": row["expected_result"],
+            "status": row["status"],
+            "suite_id": row["suite_id"],
+            "module": row["module"],
+            "created_at": row["created_at"],
+        }
+
+    def search(self, q: str = None, cursor: int = None, limit: int = 50, **filters):
+        """Return a page of cases matching ``q`` and the FILTERS given as keyword arguments.
+
+        Returns ``{"cases": [...], "next_cursor": row_id_or_None}``.
+        """
+        where = []
+        params = []
+        match = fts_query(q) if q else None
+        if match:
+            # Type and status are matched in FTS5 too; the row filters below
+            # still apply, as facet tokens drop case and punctuation
+            for name in FACETS:
+                if filters.get(name):
+                    match += f' AND facets : "{_facet(name, filters[name])}"'
+            query = "SELECT c.* FROM cases_fts f JOIN cases c ON c.id = f.rowid"
+            where.append("cases_fts MATCH ?")
+            params.append(match)
+            id_column = "f.rowid"
+        elif q:
+            # Punctuation only: nothing can match
+            return {"cases": [], "next_cursor": None}
+        else:
+            query = "SELECT c.* FROM cases c"
+            id_column = "c.id"
+        for name in FILTERS:
+            if filters.get(name):
+                where.append(f"c.{name} = ?")
+                params.append(filters[name])
+        if cursor is not None:
+            where.append(f"{id_column} < ?")
+            params.append(int(cursor))
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {id_column} DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._db().execute(query, params).fetchall()
+        next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+        return {"cases": [self._public(row) for row in rows[:limit]], "next_cursor": next_cursor}
+
+    def stats(self):
+        with self._lock:
+            db = self._db()
+            suites = db.execute("SELECT COUNT(*) FROM suites WHERE replaced_by IS NULL").fetchone()[0]
+            replaced = db.execute("SELECT COUNT(*) FROM suites WHERE replaced_by IS NOT NULL").fetchone()[0]
+            cases = db.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+        return {"suites": suites, "replaced_suites": replaced, "cases": cases}
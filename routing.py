@@ -0,0 +1,152 @@
+import copy
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from decompose import BULLET, HEADING, estimate_tokens
+from repair import TEST_CASE_TYPES
+
+# UI elements and other things that usually need test cases of their own
+FIELD_WORDS = re.compile(
+    r"\b(field|input|button|checkbox|radio|dropdown|select|link|form|page|tab|modal|dialog|upload|"
+    r"filter|toggle|menu|table|column|endpoint|role|permission|option|step|limit)s?\b",
+    re.IGNORECASE,
+)
+LIST_SEPARATORS = re.compile(r"[,;]|\band\b|\bor\b", re.IGNORECASE)
+
+# Repair notes that mean the model output had to be salvaged, not just tidied
+SALVAGE_MARKERS = ("recovered", "truncated", "dropped", "fixed JSON syntax", "not in the compact format")
+
+
+def parse_tiers(spec: str):
+    """Parse "model:min_score,model:min_score" into [(model, min_score)] sorted by score."""
+    tiers = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        model, _, score = part.rpartition(":")
+        if not model:
+            model, score = score, "0"
+        tiers.append((model.strip(), int(score)))
+    return sorted(tiers, key=lambda tier: tier[1])
+
+
+def module_complexity(module: str):
+    """Score how much a module description asks to be tested.
+
+    Counts bullet lines, list items and mentioned fields/controls
+    (``entities``) and headings (``sections``) alongside the length.
+    """
+    lines = module.splitlines()
+    bullets = sum(1 for line in lines if BULLET.match(line))
+    sections = sum(1 for line in lines if HEADING.match(line) and not BULLET.match(line))
+    entities = bullets + len(LIST_SEPARATORS.findall(module)) + len(FIELD_WORDS.findall(module))
+    tokens = estimate_tokens(module)
+    return {
+        "score": tokens // 25 + 2 * entities + 3 * sections,
+        "tokens": tokens,
+        "entities": entities,
+        "sections": sections,
+    }
+
+
+def choose_tier(tiers, score: int) -> str:
+    """Return the model of the highest tier whose minimum score is reached."""
+    model = tiers[0][0]
+    for name, min_score in tiers:
+        if score >= min_score:
+            model = name
+    return model
+
+
+def minimum_cases(complexity: dict, base: int = 8, cap: int = 30) -> int:
+    """Fewest test cases a suite for a module of this complexity should have."""
+    return min(cap, base + complexity["entities"] // 2)
+
+
+def quality_issues(suite: dict, min_cases: int):
+    """Return reasons a generated suite looks too weak to keep, if any."""
+    issues = []
+    cases = suite.get("test_cases", [])
+    if len(cases) < min_cases:
+        issues.append(f"only {len(cases)} test cases (expected at least {min_cases})")
+    types = {tc.get("type") for tc in cases}
+    missing = [t for t in TEST_CASE_TYPES if t not in types]
+    if missing:
+        issues.append(f"missing categories: {', '.join(missing)}")
+    salvaged = [r for r in suite.get("repairs", []) if any(m in r for m in SALVAGE_MARKERS)]
+    if salvaged:
+        issues.append(f"output needed repair: {'; '.join(salvaged)}")
+    if suite.get("category_errors") or suite.get("segment_errors"):
+        issues.append("part of the generation failed")
+    return issues
+
+
+class EscalationTracker:
+    """Runs background re-generations with a larger model and keeps their outcome.
+
+    Each escalation is keyed by an ID; starting one that is already pending
+    or finished is a no-op. The most recent ``max_items`` outcomes are kept.
+    """
+
+    def __init__(self, max_workers: int = 2, max_items: int = 1000):
+        self.max_workers = max_workers
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+        self.started = 0
+        self.replaced = 0
+        self.failed = 0
+
+    def start(self, escalation_id: str, fn, reasons, model: str, on_done=None):
+        """Run ``fn()`` in the background unless ``escalation_id`` is already known."""
+        with self._lock:
+            if escalation_id in self._items:
+                return self._public(self._items[escalation_id])
+            item = {"id": escalation_id, "status": "pending", "model": model, "reasons": list(reasons)}
+            self._items[escalation_id] = item
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+            self.started += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="escalate")
+        self._pool.submit(self._run, item, fn, on_done)
+        return self._public(item)
+
+    def _run(self, item, fn, on_done):
+        try:
+            result = fn()
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            if on_done:
+                on_done(result)
+        except Exception as e:
+            with self._lock:
+                item.update(status="failed", error=str(e))
+                self.failed += 1
+            return
+        with self._lock:
+            item.update(status="done", result=result)
+            self.replaced += 1
+
+    @staticmethod
+    def _public(item):
+        return {k: v for k, v in item.items() if k != "result"}
+
+    def get(self, escalation_id: str):
+        """Return a copy of an escalation's state (with ``result`` once done), or None."""
+        with self._lock:
+            item = self._items.get(escalation_id)
+            return copy.deepcopy(item) if item is not None else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "replaced": self.replaced,
+                "failed": self.failed,
+                "pending": sum(1 for item in self._items.values() if item["status"] == "pending"),
+            }
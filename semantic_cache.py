@@ -0,0 +1,106 @@
+import threading
+import zlib
+
+from cache import normalize_module_text
+
+
+def char_ngrams(text: str, sizes=(3, 4)):
+    """Hashes of the character n-grams of normalized, lowercased text."""
+    text = f" {normalize_module_text(text).lower()} "
+    hashes = []
+    for n in sizes:
+        for i in range(len(text) - n + 1):
+            hashes.append(zlib.crc32(text[i:i + n].encode("utf-8")))
+    return hashes
+
+
+class SemanticIndex:
+    """TF-IDF index over hashed character n-grams of module descriptions.
+
+    Each indexed description is a row of term counts in a fixed-width hashed
+    feature space; IDF weights come from the document frequencies of the
+    rows currently held, and queries are ranked by cosine similarity. The
+    index keeps at most ``max_items`` rows, replacing the oldest first.
+    """
+
+    def __init__(self, max_items: int = 500, dims: int = 8192, threshold: float = 0.85):
+        import numpy as np
+
+        self.np = np
+        self.max_items = max_items
+        self.dims = dims
+        self.threshold = threshold
+        self._tf = np.zeros((max_items, dims), dtype=np.float32)
+        self._df = np.zeros(dims, dtype=np.float64)
+        self._values = [None] * max_items
+        self._texts = [None] * max_items
+        self._slots = {}
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def _vector(self, text: str):
+        np = self.np
+        counts = np.bincount(
+            np.asarray(char_ngrams(text), dtype=np.uint64) % self.dims, minlength=self.dims
+        ).astype(np.float32)
+        # Sublinear term frequency
+        nonzero = counts > 0
+        counts[nonzero] = 1.0 + np.log(counts[nonzero])
+        return counts
+
+    def add(self, text: str, value):
+        """Index ``text`` and associate it with ``value`` (e.g. a suite ID)."""
+        vector = self._vector(text)
+        key = normalize_module_text(text)
+        with self._lock:
+            if key in self._slots:
+                self._values[self._slots[key]] = value
+                return
+            slot = self._next
+            if self._values[slot] is not None:
+                self._df -= self._tf[slot] > 0
+                del self._slots[self._texts[slot]]
+            self._tf[slot] = vector
+            self._df += vector > 0
+            self._values[slot] = value
+            self._texts[slot] = key
+            self._slots[key] = slot
+            self._next = (slot + 1) % self.max_items
+            self._size = min(self._size + 1, self.max_items)
+
+    def search(self, text: str, threshold: float = None):
+        """Return ``(value, similarity)`` of the closest entry above the threshold, or None."""
+        np = self.np
+        threshold = self.threshold if threshold is None else threshold
+        query = self._vector(text)
+        with self._lock:
+            self.lookups += 1
+            if not self._size:
+                return None
+            n = self._size
+            idf = np.log((1.0 + n) / (1.0 + self._df)).astype(np.float32) + 1.0
+            rows = self._tf[:n] * idf
+            q = query * idf
+            norms = np.linalg.norm(rows, axis=1) * (np.linalg.norm(q) or 1.0)
+            norms[norms == 0] = 1.0
+            scores = rows @ q / norms
+            best = int(np.argmax(scores))
+            score = float(scores[best])
+            if score < threshold:
+                return None
+            self.hits += 1
+            return self._values[best], score
+
+    def stats(self):
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                "entries": self._size,
+                "max_entries": self.max_items,
+                "threshold": self.threshold,
+            }
@@ -0,0 +1,80 @@
+import json
+import re
+
+TEST_CASES_ARRAY = re.compile(r'"test_cases"\s*:\s*\[')
+
+
+class TestCaseStreamParser:
+    """Incrementally pull test case objects out of a streamed JSON suite.
+
+    Feed it text chunks as they arrive from the model; every object that
+    closes inside the ``test_cases`` array is returned as soon as its final
+    brace is seen, without waiting for the rest of the document.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._array_closed = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._obj_start = None
+        self.count = 0
+
+    def feed(self, chunk: str):
+        """Consume a chunk and return the list of test cases it completed."""
+        self.buffer += chunk
+        found = []
+
+        if not self._in_array:
+            match = TEST_CASES_ARRAY.search(self.buffer, self._pos)
+            if not match:
+                # Keep scanning from near the end so a split key is still found
+                self._pos = max(0, len(self.buffer) - 32)
+                return found
+            self._in_array = True
+            self._pos = match.end()
+
+        if self._array_closed:
+            return found
+
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0 and ch == "{":
+                    self._obj_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0 and ch == "]":
+                    self._array_closed = True
+                    i += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0 and ch == "}" and self._obj_start is not None:
+                    try:
+                        found.append(json.loads(buf[self._obj_start:i + 1]))
+                        self.count += 1
+                    except json.JSONDecodeError:
+                        pass
+                    self._obj_start = None
+            i += 1
+        self._pos = i
+        return found
+
+    @property
+    def text(self):
+        """Everything received so far."""
+        return self.buffer
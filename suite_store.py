@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def suite_hash(suite: dict) -> str:
+    """Content hash of a suite, ignoring any suite_id it already carries."""
+    content = {k: v for k, v in suite.items() if k != "suite_id"}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class SuiteStore:
+    """Persist generated suites in SQLite under their content hash."""
+
+    def __init__(self, path="suites.db", max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS suites ("
+                " id TEXT PRIMARY KEY,"
+                " module TEXT,"
+                " data TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_suites_accessed ON suites (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    def put(self, suite: dict) -> str:
+        """Save ``suite`` and return its ID (the content hash)."""
+        suite_id = suite_hash(suite)
+        content = {k: v for k, v in suite.items() if k != "suite_id"}
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            updated = db.execute(
+                "UPDATE suites SET accessed_at = ? WHERE id = ?", (now, suite_id)
+            ).rowcount
+            if not updated:
+                db.execute(
+                    "INSERT INTO suites (id, module, data, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (suite_id, content.get("module"), json.dumps(content), now, now),
+                )
+                count = db.execute("SELECT COUNT(*) FROM suites").fetchone()[0]
+                if count > self.max_entries:
+                    db.execute(
+                        "DELETE FROM suites WHERE id IN ("
+                        " SELECT id FROM suites ORDER BY accessed_at ASC LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+            db.commit()
+        return suite_id
+
+    def get(self, suite_id: str):
+        """Return the stored suite (with its suite_id) or None."""
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT data FROM suites WHERE id = ?", (suite_id,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE suites SET accessed_at = ? WHERE id = ?", (time.time(), suite_id))
+            db.commit()
+        suite = json.loads(row[0])
+        suite["suite_id"] = suite_id
+        return suite
+
+    def exists(self, suite_id: str) -> bool:
+        with self._lock:
+            row = self._db().execute("SELECT 1 FROM suites WHERE id = ?", (suite_id,)).fetchone()
+        return row is not None
+
+
+class ArtifactCache:
+    """In-memory LRU of rendered exports keyed by (suite_id, format).
+
+    Bounded by the total size of cached artifacts; artifacts larger than
+    ``max_item_bytes`` are never cached.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_item_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, suite_id: str, fmt: str):
+        with self._lock:
+            data = self._items.get((suite_id, fmt))
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end((suite_id, fmt))
+            self.hits += 1
+            return data
+
+    def set(self, suite_id: str, fmt: str, data: bytes):
+        if len(data) > self.max_item_bytes:
+            return
+        with self._lock:
+            old = self._items.pop((suite_id, fmt), None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[(suite_id, fmt)] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._items:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._items),
+                "bytes": self._size,
+            }
@@ -0,0 +1,61 @@
+import json
+
+from compact import decode_compact, encode_compact
+
+SUITE = {
+    "module": "Login",
+    "total_test_cases": 2,
+    "test_cases": [
+        {"id": "TC-001", "title": "Valid login", "scenario": "Correct credentials", "type": "Functional",
+         "steps": ["Enter email", "Enter password", "Submit"], "expected_result": "Dashboard", "status": "Pending"},
+        {"id": "TC-002", "title": "SQL injection, \"quoted\"", "scenario": "Malicious input", "type": "Security",
+         "steps": ["Enter ' OR 1=1 --"], "expected_result": "Rejected", "status": "Pending"},
+    ],
+}
+
+
+def test_round_trip():
+    suite, repairs = decode_compact(encode_compact(SUITE), "Login")
+    assert suite == SUITE
+    assert repairs == []
+
+
+def test_strips_whitespace_and_empty_steps():
+    suite, _ = decode_compact('["N", " Empty email ", "s", ["  Submit ", " "], "Error "]', "Login")
+    case = suite["test_cases"][0]
+    assert case["type"] == "Negative"
+    assert case["title"] == "Empty email"
+    assert case["steps"] == ["Submit"]
+    assert case["expected_result"] == "Error"
+
+
+def test_accepts_fences_and_an_outer_array():
+    rows = encode_compact(SUITE).splitlines()
+    fenced = "```json\n" + encode_compact(SUITE) + "\n```"
+    wrapped = "[\n" + ",\n".join(rows) + "\n]"
+    assert decode_compact(fenced, "Login")[0] == SUITE
+    assert decode_compact(wrapped, "Login")[0] == SUITE
+
+
+def test_drops_truncated_last_row():
+    text = encode_compact(SUITE)
+    suite, repairs = decode_compact(text[:-8], "Login")
+    assert [tc["id"] for tc in suite["test_cases"]] == ["TC-001"]
+    assert suite["total_test_cases"] == 1
+    assert repairs == ["dropped truncated last row"]
+
+
+def test_rejects_invalid_rows():
+    good = encode_compact(SUITE).splitlines()[0]
+    bad_code = json.dumps(["X", "t", "s", [], "e"])
+    suite, reasons = decode_compact("\n".join([good, bad_code, good]), "Login")
+    assert suite is None
+    assert reasons[0].startswith("line 2 is not a compact row")
+    assert decode_compact(json.dumps(["F", "t", "s", "not a list", "e"]), "Login")[0] is None
+
+
+def test_rejects_other_formats():
+    suite, reasons = decode_compact(json.dumps(SUITE), "Login")
+    assert suite is None
+    assert reasons == ["line 1 is not a compact row: row must be a 5-element array"]
+    assert decode_compact("", "Login") == (None, ["no compact rows found"])
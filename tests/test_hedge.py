@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from hedge import Cancelled, Hedger
+
+
+def make_hedger(**kwargs):
+    options = {"max_rate": 1.0, "min_delay": 0.02, "min_samples": 1}
+    options.update(kwargs)
+    hedger = Hedger(**options)
+    hedger.latency.add(0.01)
+    return hedger
+
+
+class Attempts:
+    """``fn(settled)`` whose first call blocks until the other attempt has settled."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, settled):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        if number > 1:
+            return f"attempt {number}"
+        if not settled.wait(5):
+            return "primary"
+        raise Cancelled()
+
+
+def test_no_hedge_without_latency_history():
+    hedger = Hedger(min_samples=5)
+    assert hedger.call(lambda settled: "result") == "result"
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_fast_call_is_not_hedged():
+    hedger = make_hedger(min_delay=1.0)
+    assert hedger.call(lambda settled: "fast") == "fast"
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_slow_call_is_hedged_and_the_loser_cancelled():
+    hedger = make_hedger()
+    fn = Attempts()
+    assert hedger.call(fn) == "attempt 2"
+    # The loser is counted by its worker thread once it stops
+    deadline = time.monotonic() + 5
+    while hedger.stats()["cancelled"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = hedger.stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["cancelled"] == 1
+
+
+def test_errors_are_raised_when_every_attempt_fails():
+    hedger = make_hedger()
+
+    def fail(settled):
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        hedger.call(fail)
+
+
+def test_hedges_stay_within_the_budget():
+    # One hedge on the first call would exceed 0.1 x 1 call
+    hedger = make_hedger(max_rate=0.1)
+    calls = []
+
+    def slow(settled):
+        calls.append(1)
+        time.sleep(0.1)
+        return "primary"
+
+    assert hedger.call(slow) == "primary"
+    assert len(calls) == 1
+    assert hedger.stats()["over_budget"] == 1
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_queued_hedge_is_never_run():
+    # One worker: the hedge waits behind the primary and is dropped once it wins
+    hedger = make_hedger(max_workers=1)
+    calls = []
+
+    def slow(settled):
+        calls.append(1)
+        settled.wait(0.1)
+        return "primary"
+
+    assert hedger.call(slow) == "primary"
+    assert len(calls) == 1
+    assert hedger.stats()["hedged"] == 1
+    assert hedger.stats()["cancelled"] == 1
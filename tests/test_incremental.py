@@ -0,0 +1,66 @@
+from incremental import attribute_cases, module_sections, next_case_number, plan_regeneration
+
+DESCRIPTION = """# Login
+
+## Password
+Users sign in with email and password.
+
+## Lockout
+Five failed attempts lock the account.
+"""
+
+
+def case(case_id, title, status="Pending"):
+    return {"id": case_id, "title": title, "scenario": "", "steps": [], "status": status}
+
+
+PREVIOUS = {
+    "module": "Login",
+    "description": DESCRIPTION,
+    "test_cases": [
+        case("TC-001", "Sign in with valid email and password", status="Passed"),
+        case("TC-002", "Wrong password is rejected"),
+        case("TC-003", "Account locks after five failed attempts"),
+    ],
+}
+
+
+def test_sections_ignore_whitespace_and_keep_the_title_with_the_first():
+    sections = module_sections(DESCRIPTION)
+    assert [text.splitlines()[0] for _, text in sections] == ["# Login", "## Lockout"]
+    assert module_sections(DESCRIPTION.replace("\n\n", "\n\n\n")) == sections
+
+
+def test_cases_are_attributed_by_distinctive_words():
+    sections = module_sections(DESCRIPTION)
+    attribution = attribute_cases(PREVIOUS, sections)
+    assert attribution == {sections[0][0]: ["TC-001", "TC-002"], sections[1][0]: ["TC-003"]}
+
+
+def test_recorded_sections_take_precedence():
+    suite = dict(PREVIOUS, sections={"abc": ["TC-003"]})
+    assert attribute_cases(suite, module_sections(DESCRIPTION)) == {"abc": ["TC-003"]}
+
+
+def test_unchanged_sections_keep_their_cases():
+    edited = DESCRIPTION.replace("Five failed attempts", "Three failed attempts")
+    plan = plan_regeneration(PREVIOUS, edited)
+    password, lockout = plan["sections"]
+
+    assert plan["kept"] == {password[0]: PREVIOUS["test_cases"][:2]}
+    assert plan["kept"][password[0]][0]["status"] == "Passed"
+    assert plan["changed"] == [lockout[0]]
+    assert plan["removed"] == [module_sections(DESCRIPTION)[1][0]]
+
+
+def test_previous_description_overrides_the_recorded_one():
+    plan = plan_regeneration(dict(PREVIOUS, description="Something else"), DESCRIPTION,
+                             previous_description=DESCRIPTION)
+    assert plan["changed"] == []
+    assert plan["removed"] == []
+
+
+def test_next_case_number_follows_the_highest_id():
+    assert next_case_number(PREVIOUS) == 4
+    assert next_case_number({"test_cases": [case("TC-010", "a"), case("custom", "b")]}) == 11
+    assert next_case_number({}) == 1
@@ -0,0 +1,83 @@
+import time
+
+from jobs import JobQueue
+
+
+def make_queue(tmp_path, **kwargs):
+    return JobQueue(path=str(tmp_path / "jobs.db"), **kwargs)
+
+
+def test_claims_highest_priority_then_oldest(tmp_path):
+    queue = make_queue(tmp_path)
+    low = queue.submit({"module": "low"})
+    first = queue.submit({"module": "first"}, priority=5)
+    second = queue.submit({"module": "second"}, priority=5)
+
+    assert [queue._claim()["id"] for _ in range(3)] == [first, second, low]
+    assert queue._claim() is None
+
+
+def test_running_job_is_not_claimed_twice_while_leased(tmp_path):
+    queue = make_queue(tmp_path, lease=60)
+    other = make_queue(tmp_path, lease=60)
+    job_id = queue.submit({"module": "m"})
+
+    assert queue._claim()["id"] == job_id
+    assert other._claim() is None
+    assert other.get(job_id)["status"] == "running"
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    crashed = make_queue(tmp_path, lease=0.05)
+    job_id = crashed.submit({"module": "m"})
+    assert crashed._claim()["id"] == job_id
+
+    time.sleep(0.1)
+    job = make_queue(tmp_path, lease=60)._claim()
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, lease=0.01, max_attempts=2)
+    job_id = queue.submit({"module": "m"})
+    for _ in range(2):
+        assert queue._claim()["id"] == job_id
+        time.sleep(0.02)
+
+    assert queue._claim() is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "Gave up after 2 attempts"
+
+
+def test_cancelled_running_job_discards_its_result(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({"module": "m"})
+    queue._claim()
+    queue.cancel(job_id)
+    queue._finish(job_id, result={"module": "m"})
+
+    job = queue.get(job_id)
+    assert job["status"] == "cancelled"
+    assert "result" not in job
+
+
+def test_workers_run_handler_and_record_errors(tmp_path):
+    def handler(payload):
+        if payload["module"] == "bad":
+            return {"error": "Invalid JSON from model"}
+        return {"module": payload["module"], "test_cases": []}
+
+    queue = make_queue(tmp_path, handler=handler, workers=2)
+    queue.start()
+    try:
+        good = queue.wait(queue.submit({"module": "good"}), timeout=5)
+        bad = queue.wait(queue.submit({"module": "bad"}), timeout=5)
+    finally:
+        queue.stop()
+
+    assert good["status"] == "done"
+    assert good["result"] == {"module": "good", "test_cases": []}
+    assert bad["status"] == "failed"
+    assert bad["error"] == "Invalid JSON from model"
@@ -0,0 +1,97 @@
+import pytest
+
+from ratelimit import AdaptiveScheduler, TokenBucket, UpstreamRateLimited
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+class Cancelled(Exception):
+    pass
+
+
+def make_scheduler(**kwargs):
+    options = {"rpm": 0, "tpm": 0, "max_concurrency": 4, "max_retries": 2, "base_delay": 0, "max_delay": 0}
+    options.update(kwargs)
+    return AdaptiveScheduler(**options)
+
+
+def flaky(*errors, result="ok"):
+    """``fn`` that raises ``errors`` one by one, then returns ``result``."""
+    pending = list(errors)
+
+    def fn():
+        if pending:
+            raise pending.pop(0)
+        return result
+
+    return fn
+
+
+def test_token_bucket_adjust_is_capped():
+    bucket = TokenBucket(capacity=100, rate=1)
+    bucket.acquire(80)
+    bucket.adjust(-30)
+    assert bucket.tokens == pytest.approx(-10, abs=0.1)
+    bucket.adjust(500)
+    assert bucket.tokens == 100
+
+
+def test_transient_failures_are_retried():
+    scheduler = make_scheduler()
+    assert scheduler.call(flaky(StatusError(503), StatusError(500))) == "ok"
+    stats = scheduler.stats()
+    assert stats["retries"] == 2
+    assert stats["failures"] == 0
+    assert stats["active"] == 0
+
+
+def test_rate_limit_halves_concurrency_and_gives_up_after_retries():
+    scheduler = make_scheduler(max_retries=1)
+    error = StatusError(429, {"retry-after-ms": "1"})
+    with pytest.raises(UpstreamRateLimited) as raised:
+        scheduler.call(flaky(error, error))
+    assert raised.value.retry_after == 0.001
+    stats = scheduler.stats()
+    assert stats["rate_limited"] == 2
+    assert stats["concurrency_limit"] == 1
+    assert stats["failures"] == 1
+
+
+def test_other_errors_are_not_retried():
+    scheduler = make_scheduler()
+    with pytest.raises(ValueError):
+        scheduler.call(flaky(ValueError("bad request")))
+    assert scheduler.stats()["retries"] == 0
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_cancelled_calls_are_not_failures():
+    scheduler = make_scheduler(cancelled_errors=(Cancelled,))
+    with pytest.raises(Cancelled):
+        scheduler.call(flaky(Cancelled()))
+    assert scheduler.stats()["failures"] == 0
+    assert scheduler.stats()["active"] == 0
+
+
+def test_usage_corrects_the_token_bucket():
+    scheduler = make_scheduler(tpm=6000)
+    scheduler.call(flaky(), estimated_tokens=1000, usage_tokens=lambda result: 400)
+    # 1000 were taken up front; 600 of them came back
+    assert scheduler.token_bucket.tokens == pytest.approx(5600, abs=5)
+
+
+def test_held_slot_is_released_once():
+    scheduler = make_scheduler(tpm=6000)
+    result, release = scheduler.call(flaky(), estimated_tokens=1000, hold_slot=True)
+    assert result == "ok"
+    assert scheduler.stats()["active"] == 1
+
+    release(1500)
+    release(1500)
+    assert scheduler.stats()["active"] == 0
+    assert scheduler.token_bucket.tokens == pytest.approx(4500, abs=5)
@@ -0,0 +1,121 @@
+import json
+
+from repair import has_wrapping, normalize_type, repair_model_output
+
+STRIPPED = "stripped markdown/prose around JSON"
+
+
+def make_suite(n=3):
+    return {
+        "module": "Login",
+        "total_test_cases": n,
+        "test_cases": [
+            {
+                "id": f"TC-{i:03d}",
+                "title": f"Case {i} with {{braces}} and [brackets]",
+                "scenario": 'Quoted "value" inside',
+                "type": "Functional",
+                "steps": ["Open the page", "Submit"],
+                "expected_result": "Done",
+                "status": "Pending",
+            }
+            for i in range(1, n + 1)
+        ],
+    }
+
+
+def test_valid_json_needs_no_repairs():
+    suite, repairs = repair_model_output(json.dumps(make_suite()))
+    assert suite == make_suite()
+    assert repairs == []
+
+
+def test_strips_code_fences():
+    suite, repairs = repair_model_output("```json\n" + json.dumps(make_suite()) + "\n```")
+    assert suite == make_suite()
+    assert repairs == [STRIPPED]
+
+
+def test_strips_prose_before_and_after():
+    text = "Here are the test cases:\n" + json.dumps(make_suite()) + "\nLet me know if you need more."
+    suite, repairs = repair_model_output(text)
+    assert suite == make_suite()
+    assert repairs == [STRIPPED]
+
+
+def test_fixes_trailing_commas_and_python_literals():
+    text = json.dumps(make_suite(2)).replace('"Done"', '"Done", "automated": True').replace("]", ",]")
+    suite, repairs = repair_model_output(text)
+    assert repairs == ["fixed JSON syntax errors"]
+    assert suite["test_cases"][0]["automated"] is True
+    assert len(suite["test_cases"]) == 2
+
+
+def test_syntax_fix_leaves_strings_alone():
+    original = make_suite(1)
+    original["test_cases"][0]["title"] = "None of the True values, ]"
+    text = json.dumps(original).replace('"Pending"', '"Pending",')
+    suite, _ = repair_model_output(text)
+    assert suite["test_cases"][0]["title"] == "None of the True values, ]"
+
+
+def test_recovers_complete_cases_from_truncated_output():
+    text = json.dumps(make_suite(3))
+    truncated = text[:text.rindex('"expected_result"')]
+    suite, repairs = repair_model_output(truncated)
+    assert [tc["id"] for tc in suite["test_cases"]] == ["TC-001", "TC-002"]
+    assert suite["total_test_cases"] == 2
+    assert suite["module"] == "Login"
+    assert STRIPPED not in repairs
+    assert "recovered 2 complete test cases from truncated output" in repairs
+
+
+def test_truncated_fenced_output_reports_the_fence():
+    text = "```json\n" + json.dumps(make_suite(2))[:-20]
+    suite, repairs = repair_model_output(text)
+    assert len(suite["test_cases"]) == 1
+    assert repairs[0] == STRIPPED
+
+
+def test_normalizes_ids_types_statuses_and_total():
+    raw = make_suite(3)
+    raw["total_test_cases"] = 10
+    raw["test_cases"][0].update(id="1", type="Edge case", status="passed")
+    raw["test_cases"][1].update(type="Negative test cases", steps="Open; Submit")
+    raw["test_cases"][2].update(type="Functional | Negative")
+    suite, repairs = repair_model_output(json.dumps(raw))
+    cases = suite["test_cases"]
+    assert [tc["id"] for tc in cases] == ["TC-001", "TC-002", "TC-003"]
+    assert [tc["type"] for tc in cases] == ["Boundary", "Negative", "Functional"]
+    assert cases[0]["status"] == "Passed"
+    assert cases[1]["steps"] == ["Open", "Submit"]
+    assert suite["total_test_cases"] == 3
+    assert "renumbered test case IDs" in repairs
+    assert "corrected total_test_cases" in repairs
+
+
+def test_wraps_bare_list():
+    suite, repairs = repair_model_output(json.dumps(make_suite(2)["test_cases"]), module="Cart")
+    assert suite["module"] == "Cart"
+    assert len(suite["test_cases"]) == 2
+    assert "wrapped bare test case list" in repairs
+
+
+def test_unusable_output_returns_none():
+    assert repair_model_output("I cannot help with that.")[0] is None
+    assert repair_model_output('{"module": "Login", "test_cases": [{"id": "TC-0')[0] is None
+
+
+def test_has_wrapping():
+    text = json.dumps(make_suite(1))
+    assert not has_wrapping(text)
+    assert not has_wrapping(text[:-10])
+    assert has_wrapping("```\n" + text + "\n```")
+    assert has_wrapping("Sure! " + text)
+    assert has_wrapping(text + " Hope this helps")
+
+
+def test_normalize_type_defaults_to_functional():
+    assert normalize_type("Security Tests") == "Security"
+    assert normalize_type("Usability") == "Functional"
+    assert normalize_type(None) == "Functional"
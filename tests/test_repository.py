@@ -0,0 +1,71 @@
+from repository import CaseRepository, fts_query
+
+
+def make_suite(module, words, status="Pending"):
+    return {
+        "module": module,
+        "test_cases": [
+            {"id": f"TC-{i:03d}", "title": f"{word} check", "scenario": "Scenario", "type": "Functional",
+             "steps": [f"Open {word}"], "expected_result": "Works", "status": status}
+            for i, word in enumerate(words, 1)
+        ],
+    }
+
+
+def titles(page):
+    return [case["title"] for case in page["cases"]]
+
+
+def fts_rows(repo, word):
+    # Matches in the full-text table itself, so stale index entries show up
+    with repo._lock:
+        return repo._db().execute(
+            "SELECT COUNT(*) FROM cases_fts WHERE cases_fts MATCH ?", (fts_query(word),)
+        ).fetchone()[0]
+
+
+def test_search_text_filters_and_pages(tmp_path):
+    repo = CaseRepository(path=str(tmp_path / "repository.db"))
+    repo.add_suite("a", make_suite("Login", ["password", "username", "captcha"]))
+    repo.add_suite("b", make_suite("Cart", ["checkout", "coupon"], status="Passed"))
+
+    assert titles(repo.search("pass*")) == ["password check"]
+    assert titles(repo.search(status="Passed")) == ["coupon check", "checkout check"]
+    assert repo.search("?!")["cases"] == []
+
+    first = repo.search(limit=3)
+    second = repo.search(cursor=first["next_cursor"], limit=3)
+    assert len(first["cases"]) == 3
+    assert len(second["cases"]) == 2
+    assert second["next_cursor"] is None
+
+
+def test_adding_the_same_suite_twice_is_a_no_op(tmp_path):
+    repo = CaseRepository(path=str(tmp_path / "repository.db"))
+    assert repo.add_suite("a", make_suite("Login", ["password"])) == 1
+    assert repo.add_suite("a", make_suite("Login", ["password"])) == 0
+    assert repo.stats() == {"suites": 1, "replaced_suites": 0, "cases": 1}
+
+
+def test_replacing_a_suite_removes_its_cases_from_the_index(tmp_path):
+    repo = CaseRepository(path=str(tmp_path / "repository.db"))
+    repo.add_suite("v1", make_suite("Login", ["password", "lockout"]))
+    repo.add_suite("v2", make_suite("Login", ["password", "biometric"]), replaces="v1")
+
+    assert titles(repo.search("lockout")) == []
+    assert titles(repo.search("password")) == ["password check"]
+    assert fts_rows(repo, "lockout") == 0
+    assert fts_rows(repo, "password") == 1
+    assert repo.stats() == {"suites": 1, "replaced_suites": 1, "cases": 2}
+
+
+def test_reverting_to_a_replaced_suite_makes_it_current_again(tmp_path):
+    repo = CaseRepository(path=str(tmp_path / "repository.db"))
+    repo.add_suite("v1", make_suite("Login", ["lockout"]))
+    repo.add_suite("v2", make_suite("Login", ["biometric"]), replaces="v1")
+    repo.add_suite("v1", make_suite("Login", ["lockout"]), replaces="v2")
+
+    assert titles(repo.search("lockout")) == ["lockout check"]
+    assert titles(repo.search("biometric")) == []
+    assert fts_rows(repo, "biometric") == 0
+    assert repo.stats() == {"suites": 1, "replaced_suites": 1, "cases": 1}
@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, fn, callers=5):
+    """Start ``callers`` calls for ``key`` while the leader is still running ``fn``."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def leader_fn():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, leader_fn)]
+        started.wait(5)
+        futures += [pool.submit(flight.do, key, leader_fn) for _ in range(callers - 1)]
+        # Waiters are registered once they are counted as coalesced
+        while flight.stats()["coalesced"] < callers - 1:
+            time.sleep(0.001)
+        release.set()
+        return futures
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return {"test_cases": [{"id": "TC-001"}]}
+
+    results = [f.result() for f in run_concurrently(flight, "key", fn)]
+    assert len(calls) == 1
+    assert all(result == {"test_cases": [{"id": "TC-001"}]} for result in results)
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_waiters_get_their_own_copy():
+    flight = SingleFlight()
+    results = [f.result() for f in run_concurrently(flight, "key", lambda: {"test_cases": []}, callers=3)]
+    results[0]["test_cases"].append("mutated")
+    assert results[1] == {"test_cases": []}
+    assert results[2] == {"test_cases": []}
+
+
+def test_waiters_get_the_leaders_error():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    for future in run_concurrently(flight, "key", fail, callers=3):
+        with pytest.raises(RuntimeError, match="upstream down"):
+            future.result()
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_later_calls_run_again():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.stats()["executed"] == 2
@@ -0,0 +1,64 @@
+import json
+
+# Aliased so pytest does not try to collect it as a test class
+from stream_parser import TestCaseStreamParser as StreamParser
+
+CASES = [
+    {"id": "TC-001", "title": "Braces { and } in a title", "steps": ["Type [x]", "Press }"]},
+    {"id": "TC-002", "title": 'Escaped \\"quote\\" and backslash \\\\', "steps": []},
+    {"id": "TC-003", "title": "Nested", "steps": [{"action": "click", "targets": ["a", "b"]}]},
+]
+TEXT = json.dumps({"module": "Login {page}", "test_cases": CASES, "total_test_cases": 3})
+
+
+def feed_in_chunks(text, size):
+    parser = StreamParser()
+    found = []
+    for i in range(0, len(text), size):
+        found.extend(parser.feed(text[i:i + size]))
+    return parser, found
+
+
+def test_whole_document():
+    parser = StreamParser()
+    assert parser.feed(TEXT) == CASES
+    assert parser.count == 3
+
+
+def test_any_chunk_split_gives_the_same_cases():
+    for size in (1, 2, 3, 7, 16, 64):
+        parser, found = feed_in_chunks(TEXT, size)
+        assert found == CASES, size
+        assert parser.text == TEXT
+
+
+def test_cases_are_returned_as_soon_as_they_close():
+    parser = StreamParser()
+    first_end = TEXT.index("}", TEXT.index('"Press }"') + len('"Press }"')) + 1
+    assert parser.feed(TEXT[:first_end - 1]) == []
+    assert parser.feed(TEXT[first_end - 1:first_end]) == [CASES[0]]
+
+
+def test_key_split_across_chunks():
+    split = TEXT.index('"test_cases"') + 5
+    parser = StreamParser()
+    assert parser.feed(TEXT[:split]) == []
+    assert parser.feed(TEXT[split:]) == CASES
+
+
+def test_brackets_in_strings_before_the_array():
+    text = json.dumps({"module": 'Not "test_cases": [ here', "test_cases": CASES[:1]})
+    _, found = feed_in_chunks(text, 5)
+    assert found == CASES[:1]
+
+
+def test_objects_after_the_array_are_ignored():
+    text = json.dumps({"test_cases": CASES[:1], "extra": [{"id": "nope"}]})
+    parser = StreamParser()
+    assert parser.feed(text) == CASES[:1]
+    assert parser.feed('{"id": "late"}') == []
+
+
+def test_truncated_stream_keeps_complete_cases():
+    _, found = feed_in_chunks(TEXT[:TEXT.index('"TC-003"')], 4)
+    assert found == CASES[:2]
@@ -1,9 +1,12 @@
 import streamlit as st
-import json
-import pandas as pd
-from io import BytesIO
 import base64
-from app import generate_test_cases, export_to_excel, export_to_text, export_to_csv
+import importlib.util
+import time
+from contextlib import closing
+from app import can_stream, generate_test_cases, stream_test_cases, regenerate_test_cases, save_suite, export_to_excel, export_to_text, export_to_csv
+from exporter import EXCEL_MIMETYPE, render_export
+from browser import SuiteBrowser
+from suite_store import ArtifactCache, suite_hash
 
 st.set_page_config(
     page_title="AI Test Case Generator | Professional QA Tool",
@@ -52,7 +55,8 @@ def check_ip_access():
 # Check IP access
 client_ip, is_allowed = check_ip_access()
 
-# Load and encode logo for use in HTML
+# Load and encode logo for use in HTML (once per server process)
+@st.cache_resource
 def get_base64_logo():
     """Convert logo to base64 for embedding in HTML"""
     try:
@@ -64,6 +68,129 @@ def get_base64_logo():
 
 logo_base64 = get_base64_logo()
 
+BADGE_CLASSES = {
+    'Functional': 'badge-functional',
+    'Negative': 'badge-negative',
+    'Boundary': 'badge-boundary',
+    'Security': 'badge-security'
+}
+
+
+# Views and downloads are memoized by the suite's content hash, so reruns
+# (every widget interaction) reuse them instead of rebuilding from scratch
+@st.cache_resource
+def get_export_cache():
+    """Rendered downloads shared by all sessions, keyed by (suite hash, format)"""
+    return ArtifactCache(max_bytes=32 * 1024 * 1024)
+
+
+def export_payload(suite_key, fmt, result):
+    """Return the download bytes for a suite, rendering them on first request only"""
+    cache = get_export_cache()
+    data = cache.get(suite_key, fmt)
+    if data is None:
+        # Exports depend only on the suite, so they are safe to share across sessions
+        data = render_export(result, fmt)
+        cache.set(suite_key, fmt, data)
+    return data
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def count_types(suite_key, _test_cases):
+    """Number of test cases per type"""
+    types_count = {}
+    for tc in _test_cases:
+        tc_type = tc.get('type', 'Unknown')
+        types_count[tc_type] = types_count.get(tc_type, 0) + 1
+    return types_count
+
+
+PAGE_SIZES = [25, 50, 100]
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_browser(suite_key, _test_cases):
+    """Search index and filter columns of a suite, built once per suite"""
+    return SuiteBrowser(_test_cases)
+
+
+def table_row(tc):
+    """Row of the table view"""
+    return {
+        "ID": tc.get("id", ""),
+        "Title": tc.get("title", ""),
+        "Type": tc.get("type", ""),
+        "Scenario": tc.get("scenario", "")[:100] + "..." if len(tc.get("scenario", "")) > 100 else tc.get("scenario", ""),
+        "Steps": str(len(tc.get("steps", []))),
+        "Status": tc.get("status", "Pending")
+    }
+
+
+def detail_card(tc):
+    """(expander label, badge HTML, body markdown) of a test case in the detailed view"""
+    tc_type = tc.get('type', 'Unknown')
+    badge_class = BADGE_CLASSES.get(tc_type, 'badge-functional')
+    steps = "\n".join(f"{i}. {step}" for i, step in enumerate(tc.get("steps", []), 1))
+    body = (
+        f"**Scenario:** {tc.get('scenario', '')}\n\n"
+        f"**Status:** {tc.get('status', 'Pending')}\n\n"
+        f"**Test Steps:**\n\n{steps}\n\n"
+        f"**Expected Result:** {tc.get('expected_result', '')}"
+    )
+    return (
+        f"**{tc.get('id', '')}** • {tc.get('title', '')}",
+        f'<span class="badge {badge_class}">{tc_type}</span>',
+        body,
+    )
+
+
+def render_metric_cards(total_count, types_count):
+    """Total, Functional, Negative and Security & Boundary metric cards"""
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{total_count}</div>
+            <div class="metric-label">Total Cases</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{types_count.get('Functional', 0)}</div>
+            <div class="metric-label">Functional</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{types_count.get('Negative', 0)}</div>
+            <div class="metric-label">Negative</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{types_count.get('Security', 0) + types_count.get('Boundary', 0)}</div>
+            <div class="metric-label">Security & Boundary</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def reset_browser_page():
+    st.session_state['browser_page'] = 1
+
+
+def current_suite_key():
+    """Content hash of the suite in the session, computed once per generation"""
+    if 'suite_key' not in st.session_state:
+        st.session_state['suite_key'] = suite_hash(st.session_state['test_cases'])
+    return st.session_state['suite_key']
+
 # TEMPORARILY DISABLED - Allowing all IPs
 # if not is_allowed:
 #     # Display detailed access denied information
@@ -382,10 +509,7 @@ with st.sidebar:
         st.metric("Total Test Cases", total)
 
         # Count by type
-        types_count = {}
-        for tc in result.get('test_cases', []):
-            tc_type = tc.get('type', 'Unknown')
-            types_count[tc_type] = types_count.get(tc_type, 0) + 1
+        types_count = count_types(current_suite_key(), result.get('test_cases', []))
 
         for tc_type, count in types_count.items():
             st.metric(tc_type, count)
@@ -415,13 +539,77 @@ with col2:
         type="primary",
         use_container_width=True
     )
+    # After an edit, keep the cases of unchanged sections and generate only the rest
+    previous_suite = st.session_state.get('test_cases')
+    incremental = bool(previous_suite) and st.checkbox(
+        "♻️ Only regenerate changed sections",
+        value=False,
+        key="incremental",
+        help="Keeps the test cases (and their IDs and statuses) of sections you did not edit"
+    )
+
+def cancel_generation():
+    st.session_state['generation_cancelled'] = True
+
+
+def generate_progressively(module_text):
+    """Stream a generation, showing each test case as soon as it is parsed.
+
+    Returns the final suite or error dict. Cancelling reruns the script,
+    which interrupts the loop; closing the stream then aborts the upstream call.
+    """
+    status = st.empty()
+    cancel_slot = st.empty()
+    live_metrics = st.empty()
+    live_table = st.empty()
+    status.info("🔄 Analyzing requirements and generating comprehensive test cases...")
+    cancel_slot.button("⏹️ Cancel", key="cancel_generation", on_click=cancel_generation)
+
+    cases = []
+    types_count = {}
+    st.session_state['streamed_cases'] = 0
+    last_render = 0.0
+    result = None
+    with closing(stream_test_cases(module_text)) as events:
+        for event, payload in events:
+            if event != "test_case":
+                result = payload
+                break
+            cases.append(payload)
+            tc_type = payload.get('type', 'Unknown')
+            types_count[tc_type] = types_count.get(tc_type, 0) + 1
+            st.session_state['streamed_cases'] = len(cases)
+            # Redraw at most a few times per second; each redraw resends the table
+            if time.monotonic() - last_render >= 0.25:
+                last_render = time.monotonic()
+                status.info(f"🔄 Generating... {len(cases)} test cases so far")
+                with live_metrics.container():
+                    render_metric_cards(len(cases), types_count)
+                live_table.dataframe([table_row(tc) for tc in cases], use_container_width=True)
+
+    for placeholder in (status, cancel_slot, live_metrics, live_table):
+        placeholder.empty()
+    return result
+
+
+if st.session_state.pop('generation_cancelled', False):
+    st.info(f"⏹️ Generation cancelled after {st.session_state.pop('streamed_cases', 0)} test cases.")
 
 if generate_clicked:
     if not module_text.strip():
         st.warning("⚠️ Please enter a module description to generate test cases.")
     else:
-        with st.spinner("🔄 Analyzing requirements and generating comprehensive test cases..."):
-            result = generate_test_cases(module_text)
+        if incremental:
+            with st.spinner("🔄 Regenerating test cases for the changed sections..."):
+                result = regenerate_test_cases(
+                    module_text, previous_suite, st.session_state.get('module_description')
+                )
+        elif can_stream(module_text):
+            result = generate_progressively(module_text)
+        else:
+            # Long descriptions, routing and parallel categories need the full pipeline
+            with st.spinner("🔄 Analyzing requirements and generating comprehensive test cases..."):
+                result = generate_test_cases(module_text)
 
         if "error" in result:
             st.error("❌ Failed to generate test cases. Please try again.")
@@ -430,113 +618,102 @@ if generate_clicked:
         else:
             # Store result in session state
             st.session_state['test_cases'] = result
-
-            # Get all test cases
-            all_test_cases = result.get("test_cases", [])
-            total_count = len(all_test_cases)
+            st.session_state['module_description'] = module_text
+            st.session_state['suite_key'] = suite_hash(result)
+            # Keep it server-side too, so it shows up in the searchable history;
+            # a regenerated suite replaces the previous one there
+            st.session_state['saved_suite_id'] = save_suite(
+                dict(result, description=module_text),
+                replaces=st.session_state.get('saved_suite_id') if incremental else None,
+            )
+            reset_browser_page()
 
             # Success Banner
+            changes = result.get("incremental")
+            if changes:
+                message = (f"✅ Kept {changes['kept_cases']} and generated {changes['new_cases']} test cases "
+                           f"({changes['regenerated_sections']} of {changes['sections']} sections regenerated)")
+            else:
+                message = f"✅ Successfully generated {len(result.get('test_cases', []))} comprehensive test cases!"
             st.markdown(f"""
             <div class="success-banner">
-                ✅ Successfully generated {total_count} comprehensive test cases!
+                {message}
             </div>
             """, unsafe_allow_html=True)
+            for section, error in result.get("section_errors", {}).items():
+                st.warning(f"⚠️ Could not regenerate \"{section}\": {error}")
 
-            # Metrics Row
-            col1, col2, col3, col4 = st.columns(4)
-
-            types_count = {}
-            for tc in all_test_cases:
-                tc_type = tc.get('type', 'Unknown')
-                types_count[tc_type] = types_count.get(tc_type, 0) + 1
-
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">{total_count}</div>
-                    <div class="metric-label">Total Cases</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">{types_count.get('Functional', 0)}</div>
-                    <div class="metric-label">Functional</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">{types_count.get('Negative', 0)}</div>
-                    <div class="metric-label">Negative</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col4:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">{types_count.get('Security', 0) + types_count.get('Boundary', 0)}</div>
-                    <div class="metric-label">Security & Boundary</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            st.markdown("<br>", unsafe_allow_html=True)
-
-            # Tabs for different views
-            tab1, tab2, tab3 = st.tabs(["📊 Table View", "📄 Detailed View", "🔍 JSON View"])
-
-            with tab1:
-                st.markdown("### 📋 Test Cases Overview")
-                df_data = []
-                for tc in all_test_cases:
-                    df_data.append({
-                        "ID": tc.get("id", ""),
-                        "Title": tc.get("title", ""),
-                        "Type": tc.get("type", ""),
-                        "Scenario": tc.get("scenario", "")[:100] + "..." if len(tc.get("scenario", "")) > 100 else tc.get("scenario", ""),
-                        "Steps": str(len(tc.get("steps", []))),
-                        "Status": tc.get("status", "Pending")
-                    })
-                df = pd.DataFrame(df_data)
-                st.dataframe(
-                    df,
-                    use_container_width=True,
-                    height=500,
-                    column_config={
-                        "ID": st.column_config.TextColumn("Test ID", width="small"),
-                        "Title": st.column_config.TextColumn("Title", width="medium"),
-                        "Type": st.column_config.TextColumn("Type", width="small"),
-                        "Scenario": st.column_config.TextColumn("Scenario", width="large"),
-                        "Steps": st.column_config.NumberColumn("Steps", width="small"),
-                        "Status": st.column_config.TextColumn("Status", width="small"),
-                    }
-                )
+# Results (kept across reruns so the browser can be searched and paged)
+if 'test_cases' in st.session_state and st.session_state['test_cases']:
+    result = st.session_state['test_cases']
+    suite_key = current_suite_key()
+
+    # Get all test cases
+    all_test_cases = result.get("test_cases", [])
+    total_count = len(all_test_cases)
+
+    # Metrics Row
+    render_metric_cards(total_count, count_types(suite_key, all_test_cases))
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Suite browser: search and filters select the cases, only one page is rendered
+    browser = get_browser(suite_key, all_test_cases)
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    with col1:
+        search = st.text_input("🔎 Search", key="browser_search", on_change=reset_browser_page,
+                               placeholder="Search titles, scenarios and steps")
+    with col2:
+        type_filter = st.multiselect("Type", browser.types, key="browser_types", on_change=reset_browser_page)
+    with col3:
+        status_filter = st.multiselect("Status", browser.statuses, key="browser_statuses",
+                                       on_change=reset_browser_page)
+    with col4:
+        page_size = st.selectbox("Per page", PAGE_SIZES, index=1, key="browser_page_size",
+                                 on_change=reset_browser_page)
 
-            with tab2:
-                st.markdown("### 📝 Detailed Test Cases")
-                for tc in all_test_cases:
-                    tc_type = tc.get('type', 'Unknown')
-                    badge_class = {
-                        'Functional': 'badge-functional',
-                        'Negative': 'badge-negative',
-                        'Boundary': 'badge-boundary',
-                        'Security': 'badge-security'
-                    }.get(tc_type, 'badge-functional')
-
-                    with st.expander(f"**{tc.get('id', '')}** • {tc.get('title', '')}", expanded=False):
-                        st.markdown(f'<span class="badge {badge_class}">{tc_type}</span>', unsafe_allow_html=True)
-                        st.markdown(f"**Scenario:** {tc.get('scenario', '')}")
-                        st.markdown(f"**Status:** {tc.get('status', 'Pending')}")
-                        st.markdown("**Test Steps:**")
-                        for i, step in enumerate(tc.get("steps", []), 1):
-                            st.markdown(f"{i}. {step}")
-                        st.markdown(f"**Expected Result:** {tc.get('expected_result', '')}")
-
-            with tab3:
-                st.markdown("### 📄 JSON Export Preview")
-                st.json(result)
+    view = browser.query(search, type_filter, status_filter,
+                         page=st.session_state.get('browser_page', 1), page_size=page_size)
+    st.session_state['browser_page'] = view["page"]
+    page_cases = browser.page_cases(view["rows"])
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"{view['total']} of {total_count} test cases match · page {view['page']} of {view['pages']}")
+    with col2:
+        st.number_input("Page", min_value=1, max_value=view["pages"], key="browser_page",
+                        label_visibility="collapsed")
+
+    # Tabs for different views
+    tab1, tab2, tab3 = st.tabs(["📊 Table View", "📄 Detailed View", "🔍 JSON View"])
+
+    with tab1:
+        st.markdown("### 📋 Test Cases Overview")
+        st.dataframe(
+            [table_row(tc) for tc in page_cases],
+            use_container_width=True,
+            height=500,
+            column_config={
+                "ID": st.column_config.TextColumn("Test ID", width="small"),
+                "Title": st.column_config.TextColumn("Title", width="medium"),
+                "Type": st.column_config.TextColumn("Type", width="small"),
+                "Scenario": st.column_config.TextColumn("Scenario", width="large"),
+                "Steps": st.column_config.NumberColumn("Steps", width="small"),
+                "Status": st.column_config.TextColumn("Status", width="small"),
+            }
+        )
+
+    with tab2:
+        st.markdown("### 📝 Detailed Test Cases")
+        for label, badge, body in map(detail_card, page_cases):
+            with st.expander(label, expanded=False):
+                st.markdown(badge, unsafe_allow_html=True)
+                st.markdown(body)
+
+    with tab3:
+        st.markdown("### 📄 JSON Export Preview")
+        st.caption("Test cases on this page; download the JSON export below for the whole suite")
+        st.json(page_cases)
 
 # Download Section
 if 'test_cases' in st.session_state and st.session_state['test_cases']:
@@ -545,15 +722,16 @@ if 'test_cases' in st.session_state and st.session_state['test_cases']:
     st.markdown("Download your generated test cases in your preferred format")
 
     result = st.session_state['test_cases']
+    suite_key = current_suite_key()
 
+    # Payloads are callables: each file is rendered only when its button is clicked
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
         # JSON download
-        json_str = json.dumps(result, indent=2)
         st.download_button(
             label="📥 JSON",
-            data=json_str,
+            data=lambda: export_payload(suite_key, "json", result),
             file_name="test_cases.json",
             mime="application/json",
             use_container_width=True,
@@ -562,23 +740,9 @@ if 'test_cases' in st.session_state and st.session_state['test_cases']:
 
     with col2:
         # CSV download
-        df_data = []
-        for tc in result.get("test_cases", []):
-            df_data.append({
-                "ID": tc.get("id", ""),
-                "Title": tc.get("title", ""),
-                "Scenario": tc.get("scenario", ""),
-                "Type": tc.get("type", ""),
-                "Steps": "; ".join(tc.get("steps", [])),
-                "Expected Result": tc.get("expected_result", ""),
-                "Status": tc.get("status", "Pending")
-            })
-        df = pd.DataFrame(df_data)
-        csv = df.to_csv(index=False).encode('utf-8')
-
         st.download_button(
             label="📥 CSV",
-            data=csv,
+            data=lambda: export_payload(suite_key, "csv", result),
             file_name="test_cases.csv",
             mime="text/csv",
             use_container_width=True,
@@ -587,47 +751,24 @@ if 'test_cases' in st.session_state and st.session_state['test_cases']:
 
     with col3:
         # Excel download
-        try:
-            buffer = BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Test Cases')
-
+        if importlib.util.find_spec("openpyxl") is not None:
             st.download_button(
                 label="📥 Excel",
-                data=buffer.getvalue(),
+                data=lambda: export_payload(suite_key, "excel", result),
                 file_name="test_cases.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                mime=EXCEL_MIMETYPE,
                 use_container_width=True,
                 help="Download as Excel file"
             )
-        except ImportError:
+        else:
             st.button("📥 Excel", disabled=True, use_container_width=True)
             st.caption("Install openpyxl to enable")
 
     with col4:
         # Text download
-        text_content = f"AI TEST CASE GENERATOR\n"
-        text_content += f"{'=' * 80}\n\n"
-        text_content += f"MODULE: {result.get('module', 'N/A')}\n"
-        text_content += f"TOTAL TEST CASES: {result.get('total_test_cases', 0)}\n"
-        text_content += f"GENERATED: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        text_content += f"{'=' * 80}\n\n"
-
-        for tc in result.get("test_cases", []):
-            text_content += f"[{tc.get('id', '')}] {tc.get('title', '')}\n"
-            text_content += f"{'-' * 80}\n"
-            text_content += f"Type: {tc.get('type', '')}\n"
-            text_content += f"Scenario: {tc.get('scenario', '')}\n\n"
-            text_content += "Steps:\n"
-            for i, step in enumerate(tc.get("steps", []), 1):
-                text_content += f"  {i}. {step}\n"
-            text_content += f"\nExpected Result: {tc.get('expected_result', '')}\n"
-            text_content += f"Status: {tc.get('status', 'Pending')}\n"
-            text_content += f"{'=' * 80}\n\n"
-
         st.download_button(
             label="📥 Text",
-            data=text_content,
+            data=lambda: export_payload(suite_key, "text", result),
             file_name="test_cases.txt",
             mime="text/plain",
             use_container_width=True,